@@ -78,7 +78,7 @@ export default function ProjectsPage() {
                   <div className="p-6">
                     <h3 className="text-xl font-semibold mb-2">{project.title}</h3>
                     <p className="text-gray-600 text-sm mb-4 line-clamp-2">
-                      {project.short_description || project.description}
+                      {project.short_description}
                     </p>
                     <div className="flex items-center justify-between mb-4">
                       <span
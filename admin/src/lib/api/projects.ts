@@ -27,9 +27,26 @@ export interface ProjectFormData extends Omit<Project, 'id' | 'created_at' | 'up
 }
 
 export const projectsAPI = {
-  getAll: async (): Promise<Project[]> => {
-    const response = await apiClient.get<Project[]>('/api/admin/projects');
-    return response.data;
+  getAll: async (fields?: string): Promise<Project[]> => {
+    const projects: Project[] = [];
+    let cursor: string | undefined;
+    do {
+      const page = await projectsAPI.getPage(cursor, undefined, fields);
+      projects.push(...page.projects);
+      cursor = page.nextCursor;
+    } while (cursor);
+    return projects;
+  },
+
+  getPage: async (cursor?: string, limit?: number, fields?: string): Promise<{ projects: Project[]; nextCursor?: string; prevCursor?: string }> => {
+    const response = await apiClient.get<Project[]>('/api/admin/projects', {
+      params: { cursor, limit, fields },
+    });
+    return {
+      projects: response.data,
+      nextCursor: response.headers['x-next-cursor'],
+      prevCursor: response.headers['x-prev-cursor'],
+    };
   },
 
   getById: async (id: number): Promise<Project> => {
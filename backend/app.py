@@ -10,6 +10,11 @@ load_dotenv()
 # Initialize Flask app
 app = Flask(__name__)
 
+# JSON encoding with orjson when installed (stdlib json otherwise)
+from utils.json_provider import FastJSONProvider, json_loads
+app.json_provider_class = FastJSONProvider
+app.json = FastJSONProvider(app)
+
 # Configuration
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
@@ -36,12 +41,108 @@ elif database_url.startswith('sqlite'):
 app.config['SQLALCHEMY_DATABASE_URI'] = database_url
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-# Connection pooling (only for PostgreSQL, not needed for SQLite)
+# JSON columns are parsed with orjson when installed
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'json_deserializer': json_loads}
+
+# SQLite profile, applied to every new connection (see utils/db_engines.py):
+# WAL so readers never block on the writer, and writers wait up to
+# SQLITE_BUSY_TIMEOUT ms for the write lock instead of failing with
+# "database is locked"
+app.config['SQLITE_PROFILE_ENABLED'] = os.environ.get('SQLITE_PROFILE_ENABLED', 'True').lower() == 'true'
+app.config['SQLITE_JOURNAL_MODE'] = os.environ.get('SQLITE_JOURNAL_MODE', 'wal').lower()
+app.config['SQLITE_BUSY_TIMEOUT'] = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 10000))  # ms
+app.config['SQLITE_SYNCHRONOUS'] = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')  # durable in WAL mode
+app.config['SQLITE_MMAP_SIZE'] = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))  # bytes
+app.config['SQLITE_CACHE_SIZE'] = int(os.environ.get('SQLITE_CACHE_SIZE', -16000))  # negative = KiB per connection
+app.config['SQLITE_FOREIGN_KEYS'] = 'ON'
+app.config['SQLITE_TEMP_STORE'] = 'MEMORY'
+# Pooled connections per worker process, shared by its threads
+app.config['SQLITE_POOL_SIZE'] = int(os.environ.get('SQLITE_POOL_SIZE', 5))
+app.config['SQLITE_MAX_OVERFLOW'] = int(os.environ.get('SQLITE_MAX_OVERFLOW', 10))
+app.config['SQLITE_POOL_TIMEOUT'] = int(os.environ.get('SQLITE_POOL_TIMEOUT', 30))  # seconds
+
+# PostgreSQL connection pool, per worker process. By default it is sized from
+# the gunicorn worker/thread counts (one connection per request thread, plus
+# as many overflow) within an even share of DB_MAX_CONNECTIONS across workers.
+app.config['GUNICORN_WORKERS'] = int(os.environ.get('WEB_CONCURRENCY', 2))
+app.config['GUNICORN_THREADS'] = int(os.environ.get('GUNICORN_THREADS', 1))
+app.config['DB_MAX_CONNECTIONS'] = int(os.environ.get('DB_MAX_CONNECTIONS', 0)) or None  # server budget for this app
+app.config['DB_POOL_SIZE'] = int(os.environ.get('DB_POOL_SIZE', 0)) or None  # override the derived size
+app.config['DB_MAX_OVERFLOW'] = int(os.environ['DB_MAX_OVERFLOW']) if os.environ.get('DB_MAX_OVERFLOW') else None
+app.config['DB_POOL_TIMEOUT'] = float(os.environ.get('DB_POOL_TIMEOUT', 10))  # seconds to wait for a connection
+app.config['DB_POOL_RECYCLE'] = int(os.environ.get('DB_POOL_RECYCLE', 300))  # seconds
+# Ping on every checkout (an extra round trip per request); off by default in
+# favour of pinging only connections idle longer than DB_PING_IDLE_SECONDS
+app.config['DB_POOL_PRE_PING'] = os.environ.get('DB_POOL_PRE_PING', 'False').lower() == 'true'
+app.config['DB_PING_IDLE_SECONDS'] = float(os.environ.get('DB_PING_IDLE_SECONDS', 60))
+# Async engine pool of the ASGI read path (asgi.py), per process: requests
+# share it as coroutines, so it is sized for queries in flight, not clients
+app.config['ASGI_DB_POOL_SIZE'] = int(os.environ.get('ASGI_DB_POOL_SIZE', 10))
+app.config['ASGI_DB_MAX_OVERFLOW'] = int(os.environ.get('ASGI_DB_MAX_OVERFLOW', 10))
+
+# Connection pooling
+from utils.db_engines import postgres_engine_options, sqlite_engine_options
 if database_url.startswith('postgresql://'):
-    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-        'pool_pre_ping': True,  # Verify connections before using
-        'pool_recycle': 300,    # Recycle connections after 5 minutes
-    }
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'].update(postgres_engine_options(app.config))
+elif (database_url.startswith('sqlite') and app.config['SQLITE_PROFILE_ENABLED']
+      and ':memory:' not in database_url and database_url != 'sqlite://'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'].update(sqlite_engine_options(app.config))
+
+# Read replica for GET requests to the public API (unset = primary only); the
+# primary is used while the replica lags by more than REPLICA_MAX_LAG seconds or
+# is down, and for REPLICA_STICKY_SECONDS after a client's own write
+replica_url = os.environ.get('DATABASE_REPLICA_URL')
+if replica_url:
+    if replica_url.startswith('postgres://'):
+        replica_url = replica_url.replace('postgres://', 'postgresql://', 1)
+    app.config['SQLALCHEMY_BINDS'] = {'replica': replica_url}
+    print("✅ Using read replica for public reads")
+app.config['REPLICA_MAX_LAG'] = float(os.environ.get('REPLICA_MAX_LAG', 5))  # seconds
+app.config['REPLICA_CHECK_INTERVAL'] = float(os.environ.get('REPLICA_CHECK_INTERVAL', 5))  # seconds
+app.config['REPLICA_STICKY_SECONDS'] = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+
+# Public response cache (evicted automatically when admin edits commit)
+app.config['RESPONSE_CACHE_ENABLED'] = os.environ.get('RESPONSE_CACHE_ENABLED', 'True').lower() == 'true'
+app.config['RESPONSE_CACHE_MAX_ENTRIES'] = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 256))
+app.config['RESPONSE_CACHE_TTL'] = int(os.environ.get('RESPONSE_CACHE_TTL', 60))
+# Where entries live: 'memory' (per worker), 'sqlite' (shared by the workers on
+# this host) or 'redis' (shared by every host)
+app.config['RESPONSE_CACHE_BACKEND'] = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory').lower()
+app.config['RESPONSE_CACHE_PATH'] = os.environ.get(
+    'RESPONSE_CACHE_PATH', os.path.join(os.path.dirname(__file__), 'instance', 'response_cache.sqlite3')
+)
+app.config['RESPONSE_CACHE_REDIS_URL'] = os.environ.get('RESPONSE_CACHE_REDIS_URL', os.environ.get('REDIS_URL', 'redis://localhost:6379/0'))
+# Upper bound (seconds) on serving an entry after a commit in another worker
+app.config['RESPONSE_CACHE_SYNC_INTERVAL'] = float(os.environ.get('RESPONSE_CACHE_SYNC_INTERVAL', 1.0))
+# Stale-while-revalidate views (/api/portfolio): how long the previous response may
+# be served while one request rebuilds it, and how long that rebuild may hold its lock
+app.config['RESPONSE_CACHE_MAX_STALE'] = float(os.environ.get('RESPONSE_CACHE_MAX_STALE', 30))
+app.config['RESPONSE_CACHE_LOCK_TIMEOUT'] = float(os.environ.get('RESPONSE_CACHE_LOCK_TIMEOUT', 10))
+
+# Compression of public JSON responses (each content version is compressed once)
+app.config['COMPRESSION_ENABLED'] = os.environ.get('COMPRESSION_ENABLED', 'True').lower() == 'true'
+app.config['COMPRESSION_MIN_SIZE'] = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))  # bytes
+app.config['COMPRESSION_CACHE_MAX_BYTES'] = int(os.environ.get('COMPRESSION_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+# Server-Sent Events stream (/api/stream)
+# Whether this process serves it: gunicorn.conf.py turns it off for the gthread
+# and sync profiles (each stream would hold a worker thread) and the gevent
+# sidecar (gunicorn_stream.conf.py) turns it on
+app.config['STREAM_ENABLED'] = os.environ.get('STREAM_ENABLED', 'True').lower() == 'true'
+app.config['STREAM_POLL_INTERVAL'] = float(os.environ.get('STREAM_POLL_INTERVAL', 1.0))  # seconds
+app.config['STREAM_HEARTBEAT_INTERVAL'] = float(os.environ.get('STREAM_HEARTBEAT_INTERVAL', 15))  # seconds
+# Close each stream after this many seconds (0 = never) so it cannot outlive the
+# gunicorn timeout of a sync worker; clients reconnect and resume transparently
+app.config['STREAM_MAX_DURATION'] = float(os.environ.get('STREAM_MAX_DURATION', 25))
+app.config['STREAM_RETRY_MS'] = int(os.environ.get('STREAM_RETRY_MS', 3000))
+
+# Next.js on-demand revalidation webhooks (comma-separated URLs; empty = disabled)
+app.config['REVALIDATE_WEBHOOK_URLS'] = [url.strip() for url in os.environ.get('REVALIDATE_WEBHOOK_URLS', '').split(',') if url.strip()]
+app.config['REVALIDATE_SECRET'] = os.environ.get('REVALIDATE_SECRET')
+# Edits within this many seconds of each other are sent as one call...
+app.config['REVALIDATE_DEBOUNCE'] = float(os.environ.get('REVALIDATE_DEBOUNCE', 2.0))
+# ...but a continuous burst is flushed at least this often
+app.config['REVALIDATE_MAX_WAIT'] = float(os.environ.get('REVALIDATE_MAX_WAIT', 10.0))
 
 # File upload configuration
 UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'uploads')
@@ -60,7 +161,8 @@ CORS(app, resources={
     r"/api/*": {
         "origins": os.environ.get('ALLOWED_ORIGINS', '*').split(','),
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"]
+        "allow_headers": ["Content-Type", "Authorization"],
+        "expose_headers": ["X-Next-Cursor", "X-Prev-Cursor"]
     }
 })
 
@@ -80,9 +182,21 @@ from models import db
 from models.admin import bcrypt
 from flask_jwt_extended import JWTManager
 from flask_mail import Mail
+from utils.response_cache import response_cache
+from utils.compression import compression_cache
+from utils.event_stream import change_broadcaster
+from utils.revalidation import revalidation_sender
+from utils.read_replica import replica_router
+from utils import db_engines
 
 db.init_app(app)
+db_engines.init_app(app)
+replica_router.init_app(app)
 bcrypt.init_app(app)
+response_cache.init_app(app)
+compression_cache.init_app(app)
+change_broadcaster.init_app(app)
+revalidation_sender.init_app(app)
 jwt = JWTManager(app)
 mail = Mail(app)
 
@@ -115,6 +229,41 @@ with app.app_context():
     # Create tables (only if using SQLite, otherwise use migrations)
     if database_url.startswith('sqlite'):
         db.create_all()
+        
+        # create_all() skips indexes added to tables that already exist
+        from utils.query_plans import ensure_indexes
+        try:
+            for index_name in ensure_indexes():
+                print(f"🔄 Created index {index_name}")
+        except Exception as e:
+            print(f"⚠️  Could not create missing indexes: {e}")
+    
+    # Full-text search index (FTS5 on SQLite, tsvector + GIN on PostgreSQL)
+    from utils.search import init_search_index
+    try:
+        print(f"🔎 Project search backend: {init_search_index()}")
+    except Exception as e:
+        db.session.rollback()
+        print(f"⚠️  Could not initialize search index: {e}")
+        print("💡 Run database migrations first: flask db upgrade")
+    
+    # Populate the normalized technology table for projects created before it existed
+    from utils.technologies import needs_backfill, backfill_project_technologies
+    try:
+        if needs_backfill():
+            print(f"🔄 Indexed technologies of {backfill_project_technologies()} projects")
+    except Exception as e:
+        db.session.rollback()
+        print(f"⚠️  Could not backfill project technologies: {e}")
+    
+    # Seed the change log with the entities that existed before it
+    from utils.change_log import needs_backfill as change_log_needs_backfill, backfill_change_log
+    try:
+        if change_log_needs_backfill():
+            print(f"🔄 Logged {backfill_change_log()} existing portfolio entities")
+    except Exception as e:
+        db.session.rollback()
+        print(f"⚠️  Could not backfill the change log: {e}")
     
     # Create default admin if it doesn't exist
     from models.admin import Admin
@@ -0,0 +1,305 @@
+"""
+ASGI entry point for the read-only public API
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5003
+
+Serves the GET endpoints of the public blueprint under the same URLs, with the
+same payloads, ETags (and 304s), X-Snapshot-Version headers and
+MessagePack/CBOR and gzip/brotli negotiation, on an async SQLAlchemy engine:
+aiosqlite for SQLite, asyncpg for PostgreSQL. Each request is a coroutine, so
+thousands of idle keep-alive connections need no OS threads.
+
+Queries and serializers are the Flask app's own (utils.public_reads,
+utils.change_log, the snapshot table), run on the async engine through
+AsyncSession.run_sync(). Everything else stays on the WSGI app
+(gunicorn.conf.py): the admin blueprint, the public writes (/api/subscribe,
+/api/unsubscribe, /api/contact) and /api/stream; route those paths there at
+the proxy. Reads go to the primary database (the replica routing of
+utils.read_replica is not applied), and responses are not kept in the
+response cache - snapshots and ETags do that work here.
+
+`flask check-asgi-parity` diffs the responses of both implementations.
+"""
+import os
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.exceptions import NotFound
+from werkzeug.http import parse_accept_header, parse_etags
+
+from app import app as flask_app, UPLOAD_FOLDER
+from models import (
+    Project, ProjectTechnology, PersonalInfo, ImpactMetric, TechnicalSkill,
+    Experience, Education, Certification, SocialLink, PortfolioSnapshot
+)
+from utils import public_reads, search
+from utils.binary_formats import FORMAT_SUFFIXES, encode_body, preferred_format
+from utils.change_log import LOGGED_MODELS, changes_since
+from utils.compression import COMPRESSIBLE_MIMETYPES, compression_cache
+from utils.content_versions import current_versions
+from utils.db_engines import create_async_read_engine
+from utils.portfolio_snapshots import get_snapshot
+from utils.response_cache import cache_key, content_etag, matching_etag
+
+engine = create_async_read_engine(flask_app)
+sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+# Detected once through the sync engine; ranked_matches() only reads the result
+with flask_app.app_context():
+    search.search_backend()
+
+
+class Reply:
+    """A view's response before ETags and content negotiation are applied"""
+
+    __slots__ = ('body', 'status', 'mimetype', 'headers')
+
+    def __init__(self, body, status=200, mimetype='application/json', headers=None):
+        self.body = body
+        self.status = status
+        self.mimetype = mimetype
+        self.headers = headers or {}
+
+
+def json_reply(payload, status=200):
+    """Reply encoded exactly as jsonify would"""
+    return Reply(flask_app.json.encode(payload), status)
+
+
+def not_found():
+    return Reply(NotFound().get_body(), 404, 'text/html; charset=utf-8')
+
+
+def _arg(args, name, default=None):
+    # The first value, as Flask's request.args.get()
+    values = args.getlist(name)
+    return values[0] if values else default
+
+
+def _int_arg(args, name):
+    try:
+        return int(_arg(args, name))
+    except (TypeError, ValueError):
+        return None
+
+
+def _finish(request, reply, etag=None):
+    """The public blueprint's after_request hooks: negotiate the format, then the content-coding"""
+    body, mimetype, digest = reply.body, reply.mimetype, None
+    headers = dict(reply.headers)
+    vary = []
+    if request.method == 'GET' and reply.status == 200:
+        if mimetype == 'application/json':
+            vary.append('Accept')
+            preferred = preferred_format(parse_accept_header(request.headers.get('accept'), MIMEAccept))
+            if preferred is not None:
+                body, digest = encode_body(body, preferred)
+                mimetype = preferred
+                etag = etag and f"{etag}-{FORMAT_SUFFIXES[preferred]}"
+        if compression_cache.enabled and (mimetype == 'application/json' or mimetype in COMPRESSIBLE_MIMETYPES):
+            vary.append('Accept-Encoding')
+            encoding = None
+            if len(body) >= compression_cache.min_size:
+                encoding = parse_accept_header(request.headers.get('accept-encoding')).best_match(
+                    compression_cache.encodings
+                )
+            if encoding:
+                body = compression_cache.compressed(body, encoding, digest)
+                headers['Content-Encoding'] = encoding
+                # A strong ETag must differ per content-coding
+                etag = etag and f"{etag}-{encoding}"
+    if etag:
+        headers['ETag'] = f'"{etag}"'
+    if vary:
+        headers['Vary'] = ', '.join(vary)
+    return Response(body, reply.status, headers=headers, media_type=mimetype)
+
+
+def read_view(*models):
+    """
+    Run an async view with a session on the async engine, validated like
+    cached_response(*models): a matching If-None-Match gets a 304 without
+    running the view, and a 200 JSON reply the ETag derived from the change
+    counters of the tables of `models`
+    """
+    tags = frozenset(model.__tablename__ for model in models)
+
+    def decorator(view):
+        async def endpoint(request):
+            etag = None
+            async with sessions() as session:
+                if request.method == 'GET':
+                    key = cache_key(request.url.path, request.query_params.multi_items())
+                    versions = await session.run_sync(lambda sync_session: current_versions(tags, sync_session))
+                    etag = content_etag(key, versions)
+                    if_none_match = request.headers.get('if-none-match')
+                    if if_none_match:
+                        matched = matching_etag(etag, parse_etags(if_none_match))
+                        if matched:
+                            return Response(status_code=304, headers={'ETag': f'"{matched}"'})
+                reply = await view(request, session)
+            if reply.status != 200 or reply.mimetype != 'application/json':
+                etag = None
+            return _finish(request, reply, etag)
+        endpoint.__name__ = view.__name__
+        endpoint.__doc__ = view.__doc__
+        return endpoint
+    return decorator
+
+
+def _build_snapshot(key):
+    # Fresh database: build the snapshots once through the WSGI app's engine
+    with flask_app.app_context():
+        snapshot = get_snapshot(key)
+        return snapshot.payload, snapshot.version
+
+
+async def snapshot_reply(session, key):
+    """Serve a snapshot's pre-encoded bytes (building every snapshot when it is missing)"""
+    snapshot = await session.get(PortfolioSnapshot, key)
+    if snapshot is None:
+        payload, version = await run_in_threadpool(_build_snapshot, key)
+    else:
+        payload, version = snapshot.payload, snapshot.version
+    return Reply(payload, headers={'X-Snapshot-Version': str(version)})
+
+
+def snapshot_view(key, *models):
+    @read_view(*models)
+    async def view(request, session):
+        return await snapshot_reply(session, key)
+    view.__name__ = f"snapshot_{key.replace('-', '_')}"
+    return view
+
+
+HEALTH = {"status": "healthy", "message": "Flask backend is running"}
+
+
+async def health_check(request):
+    """Health check endpoint"""
+    return _finish(request, json_reply(HEALTH))
+
+
+async def root_health(request):
+    """Root health check for Render"""
+    return Response(flask_app.json.encode(HEALTH), media_type='application/json')
+
+
+@read_view(Project)
+async def get_projects(request, session):
+    """Published projects, newest first, one page at a time (see public_routes.get_projects)"""
+    args = request.query_params
+    try:
+        payload = await session.run_sync(
+            public_reads.project_page,
+            fields=_arg(args, 'fields'),
+            featured=bool(_arg(args, 'featured')),
+            category=_arg(args, 'category'),
+            technologies=args.getlist('tech'),
+            tech_match=_arg(args, 'tech_match', 'all'),
+            limit=_int_arg(args, 'limit'),
+            cursor=_arg(args, 'cursor'),
+        )
+    except ValueError as e:
+        return json_reply({'error': str(e)}, 400)
+    return json_reply(payload)
+
+
+@read_view(Project)
+async def search_projects(request, session):
+    """Full-text search over published projects, best match first"""
+    args = request.query_params
+    try:
+        payload = await session.run_sync(
+            public_reads.project_search,
+            _arg(args, 'q', ''),
+            fields=_arg(args, 'fields'),
+            limit=_int_arg(args, 'limit'),
+            cursor=_arg(args, 'cursor'),
+        )
+    except ValueError as e:
+        return json_reply({'error': str(e)}, 400)
+    return json_reply(payload)
+
+
+@read_view(Project)
+async def get_project(request, session):
+    """Get a specific published project"""
+    project = await session.run_sync(public_reads.published_project, request.path_params['project_id'])
+    if project is None:
+        return not_found()
+    return json_reply(project)
+
+
+@read_view(PersonalInfo)
+async def get_personal_info(request, session):
+    """Get personal information"""
+    reply = await snapshot_reply(session, 'personal-info')
+    if reply.body.strip() == b'null':
+        return json_reply({'error': 'Personal info not found'}, 404)
+    return reply
+
+
+@read_view(*LOGGED_MODELS.values())
+async def get_portfolio_changes(request, session):
+    """Entities upserted or deleted since ?since=<version>, oldest first"""
+    since = _arg(request.query_params, 'since', '0')
+    if not since.isdecimal():
+        return json_reply({'error': 'since must be a non-negative integer'}, 400)
+    payload = await session.run_sync(lambda sync_session: changes_since(int(since), session=sync_session))
+    return json_reply(payload)
+
+
+async def handle_not_found(request, exc):
+    return _finish(request, not_found())
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await engine.dispose()
+
+
+routes = [
+    Route('/health', root_health),
+    Route('/api/health', health_check),
+    Route('/api/projects', get_projects),
+    Route('/api/projects/facets', snapshot_view('projects-facets', Project, ProjectTechnology)),
+    Route('/api/projects/search', search_projects),
+    Route('/api/projects/featured', snapshot_view('projects-featured', Project)),
+    Route('/api/projects/{project_id:int}', get_project),
+    Mount('/api/uploads', app=StaticFiles(directory=UPLOAD_FOLDER, check_dir=False)),
+    Route('/api/personal-info', get_personal_info),
+    Route('/api/impact-metrics', snapshot_view('impact-metrics', ImpactMetric)),
+    Route('/api/technical-skills', snapshot_view('technical-skills', TechnicalSkill)),
+    Route('/api/experiences', snapshot_view('experiences', Experience)),
+    Route('/api/educations', snapshot_view('educations', Education)),
+    Route('/api/certifications', snapshot_view('certifications', Certification)),
+    Route('/api/social-links', snapshot_view('social-links', SocialLink)),
+    Route('/api/portfolio', snapshot_view(
+        'portfolio', PersonalInfo, ImpactMetric, TechnicalSkill, Experience,
+        Education, Certification, SocialLink, Project
+    )),
+    Route('/api/portfolio/changes', get_portfolio_changes),
+]
+
+app = Starlette(
+    routes=routes,
+    middleware=[Middleware(
+        CORSMiddleware,
+        allow_origins=os.environ.get('ALLOWED_ORIGINS', '*').split(','),
+        allow_methods=['GET', 'OPTIONS'],
+        allow_headers=['Content-Type', 'Authorization'],
+        expose_headers=['X-Next-Cursor', 'X-Prev-Cursor'],
+    )],
+    exception_handlers={404: handle_not_found},
+    lifespan=lifespan,
+)
@@ -0,0 +1,54 @@
+"""
+JSON vs. MessagePack vs. CBOR for public payloads: encoded size, encode and
+decode CPU time, and the per-request cost of serving each format once the
+re-encoded body is cached.
+
+    python benchmarks/binary_formats.py [--projects 200] [--repeat 200]
+"""
+import argparse
+import json
+
+from common import create_seeded_app, timed
+
+ENDPOINTS = ['/api/portfolio', '/api/projects?fields=full&limit=100', '/api/experiences']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    app = create_seeded_app(args.projects)
+    client = app.test_client()
+
+    from utils.binary_formats import MSGPACK_AVAILABLE, CBOR_AVAILABLE
+    codecs = {'json': (lambda payload: app.json.dumps(payload).encode('utf-8'), json.loads)}
+    if MSGPACK_AVAILABLE:
+        import msgpack
+        codecs['msgpack'] = (lambda payload: msgpack.packb(payload, use_bin_type=True), msgpack.unpackb)
+    if CBOR_AVAILABLE:
+        import cbor2
+        codecs['cbor'] = (cbor2.dumps, cbor2.loads)
+
+    print(f"\n{'endpoint':<38} {'format':<8} {'bytes':>8} {'encode us':>10} {'decode us':>10}")
+    for url in ENDPOINTS:
+        payload = client.get(url).get_json()
+        for name, (encode, decode) in codecs.items():
+            with app.app_context():
+                body, encode_cpu = timed(lambda: encode(payload), args.repeat)
+            _, decode_cpu = timed(lambda: decode(body), args.repeat)
+            print(f"{url:<38} {name:<8} {len(body):>8} {encode_cpu * 1e6:>10.1f} {decode_cpu * 1e6:>10.1f}")
+
+    mimetypes = {'json': 'application/json', 'msgpack': 'application/msgpack', 'cbor': 'application/cbor'}
+    print(f"\n{'endpoint':<38} {'format':<8} {'served CPU us/req':>18}")
+    for url in ENDPOINTS:
+        for name in codecs:
+            headers = {'Accept': mimetypes[name]}
+            client.get(url, headers=headers)  # warm the response and re-encoding caches
+            _, cpu = timed(lambda: client.get(url, headers=headers), args.repeat)
+            print(f"{url:<38} {name:<8} {cpu * 1e6:>18.1f}")
+
+
+if __name__ == '__main__':
+    main()
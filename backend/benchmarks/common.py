@@ -0,0 +1,79 @@
+"""
+Shared setup for the benchmark scripts: the Flask app on a throwaway SQLite
+database seeded with a realistic amount of portfolio content.
+"""
+import os
+import socket
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+LOREM = (
+    'Built an end-to-end platform with a React frontend, a Flask API and a '
+    'PostgreSQL database, focusing on performance, accessibility and testing. '
+)
+
+
+def create_seeded_app(projects=200):
+    """Import the app against a fresh SQLite file and fill it with sample content"""
+    db_path = os.path.join(tempfile.mkdtemp(prefix='portfolio-bench-'), 'bench.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    from app import app
+    from models import (
+        db, Project, PersonalInfo, ImpactMetric, TechnicalSkill,
+        Experience, Education, Certification, SocialLink
+    )
+
+    with app.app_context():
+        db.session.add(PersonalInfo(
+            name='Jane Doe', title='Full-Stack Engineer', tagline=LOREM,
+            email='jane@example.com', phone='+1 555 0100', location='Remote'
+        ))
+        for i in range(6):
+            db.session.add(ImpactMetric(value=10 * i, suffix='%', label=f'Metric {i}', order=i))
+        for category in ['core', 'frontend', 'backend', 'database', 'devops']:
+            for i in range(8):
+                db.session.add(TechnicalSkill(name=f'{category}-skill-{i}', category=category, order=i))
+        for i in range(8):
+            db.session.add(Experience(
+                company=f'Company {i}', location='Remote', role='Engineer', period='2020-2024',
+                achievements=[LOREM] * 6, order=i
+            ))
+            db.session.add(Education(degree=f'Degree {i}', institution='University', period='2016-2020', type='degree', order=i))
+            db.session.add(Certification(name=f'Certification {i}', issuer='Issuer', order=i))
+            db.session.add(SocialLink(name=f'Link {i}', url=f'https://example.org/{i}', icon='fa-link', order=i))
+        for i in range(projects):
+            db.session.add(Project(
+                title=f'Project {i}', description=LOREM * 10, short_description=LOREM,
+                thumbnail_image=f'/uploads/projects/{i}.png',
+                screenshots=[f'/uploads/screenshots/{i}-{n}.png' for n in range(4)],
+                live_link='https://example.org', github_link='https://github.com/example/project',
+                technologies=['React', 'TypeScript', 'Flask', 'PostgreSQL'][: 1 + i % 4],
+                category=['web', 'mobile', 'desktop'][i % 3], featured=i % 5 == 0, status='published'
+            ))
+        db.session.commit()
+    return app
+
+
+def timed(fn, repeat):
+    """Run fn `repeat` times; return (result of the last call, CPU seconds per call)"""
+    start = time.process_time()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.process_time() - start) / repeat
+
+
+def wait_for_server(port, timeout=30):
+    """Block until something accepts connections on 127.0.0.1:`port`"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'server did not start on port {port}')
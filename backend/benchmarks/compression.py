@@ -0,0 +1,43 @@
+"""
+Bytes on the wire and CPU per request for public JSON endpoints, uncompressed
+vs. gzip/brotli negotiated through the compression cache.
+
+    python benchmarks/compression.py [--projects 200] [--repeat 200]
+"""
+import argparse
+
+from common import create_seeded_app, timed
+
+ENDPOINTS = ['/api/portfolio', '/api/projects', '/api/experiences']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    app = create_seeded_app(args.projects)
+    client = app.test_client()
+
+    print(f"\n{'endpoint':<20} {'encoding':<10} {'bytes':>10} {'CPU us/req':>12}")
+    for url in ENDPOINTS:
+        for encoding in ['identity', 'gzip', 'br']:
+            headers = {'Accept-Encoding': encoding}
+            client.get(url, headers=headers)  # warm the response and compression caches
+            response, cpu = timed(lambda: client.get(url, headers=headers), args.repeat)
+            served = response.headers.get('Content-Encoding', 'identity')
+            print(f"{url:<20} {served:<10} {len(response.get_data()):>10} {cpu * 1e6:>12.1f}")
+
+    # Cost without the compression cache: recompress on every request
+    from utils.compression import _compress
+    print(f"\n{'endpoint':<20} {'encoding':<10} {'uncached CPU us/req':>20}")
+    for url in ENDPOINTS:
+        body = client.get(url).get_data()
+        for encoding in ['gzip', 'br']:
+            _, cpu = timed(lambda: _compress(body, encoding), max(1, args.repeat // 10))
+            print(f"{url:<20} {encoding:<10} {cpu * 1e6:>20.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Stdlib json vs. the orjson-backed FastJSONProvider: CPU time spent encoding the
+/api/portfolio and /api/projects payloads, per request and per project row, and
+the CPU cost of a whole uncached /api/projects request under each provider.
+
+    python benchmarks/json_provider.py [--projects 1000] [--repeat 50]
+"""
+import argparse
+
+from common import create_seeded_app, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--projects', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_seeded_app(args.projects)
+    client = app.test_client()
+
+    from flask.json.provider import DefaultJSONProvider
+    from models import Project
+    from utils.json_provider import FastJSONProvider, ORJSON_AVAILABLE
+    from utils.portfolio_snapshots import SECTIONS, build_portfolio_payload
+
+    class StdlibJSONProvider(DefaultJSONProvider):
+        # The fallback path: stdlib encoder with ISO 8601 datetimes
+        default = staticmethod(FastJSONProvider.default)
+
+    providers = {'stdlib': StdlibJSONProvider(app)}
+    if ORJSON_AVAILABLE:
+        providers['orjson'] = FastJSONProvider(app)
+    else:
+        print('orjson is not installed: only the stdlib encoder is measured')
+
+    with app.app_context():
+        portfolio = build_portfolio_payload({key: builder() for key, (builder, _) in SECTIONS.items()})
+        projects = Project.query.filter_by(status='published').order_by(Project.created_at.desc()).all()
+        payloads = {
+            '/api/portfolio': (portfolio, len(portfolio['featuredProjects'])),
+            f'/api/projects ({len(projects)} rows)': (
+                {'count': len(projects), 'projects': [p.to_dict() for p in projects]}, len(projects)
+            ),
+        }
+
+    print(f"\n{'payload':<30} {'provider':<8} {'bytes':>9} {'encode us/req':>14} {'us/row':>8}")
+    for name, (payload, rows) in payloads.items():
+        for provider_name, provider in providers.items():
+            with app.app_context():
+                body, cpu = timed(lambda: provider.response(payload).get_data(), args.repeat)
+            print(f"{name:<30} {provider_name:<8} {len(body):>9} {cpu * 1e6:>14.1f} {cpu * 1e6 / rows:>8.2f}")
+
+    # Whole requests, bypassing the response cache, so the route's own encoding is included
+    app.config['RESPONSE_CACHE_ENABLED'] = False
+    app.extensions['response_cache'].enabled = False
+    url = '/api/projects?fields=full&limit=100'
+    print(f"\n{'request':<38} {'provider':<8} {'CPU us/req':>11}")
+    for provider_name, provider in providers.items():
+        app.json = provider
+        client.get(url)
+        _, cpu = timed(lambda: client.get(url), args.repeat)
+        print(f"{url:<38} {provider_name:<8} {cpu * 1e6:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
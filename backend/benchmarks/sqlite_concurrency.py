@@ -0,0 +1,144 @@
+"""
+Concurrent reads and writes against one SQLite file, with and without the
+SQLite profile (WAL, busy_timeout, pragmas, pooling): several forked worker
+processes, each with several threads, mix uncached public reads with
+/api/subscribe and /api/contact writes, as gunicorn workers would. Reports
+throughput, latency and how many requests failed with "database is locked".
+
+    python benchmarks/sqlite_concurrency.py [--workers 4] [--threads 8] [--duration 10] [--write-ratio 0.3]
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from common import create_seeded_app
+
+READS = ['/api/projects?limit=20', '/api/projects?fields=full&limit=5', '/api/portfolio/changes?since=0']
+
+
+def worker(app, worker_id, args, results):
+    from models import db
+    # Each forked worker opens its own connections (as the app does after a gunicorn fork)
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+    client = app.test_client()
+    deadline = time.monotonic() + args.duration
+    samples = {'read': [], 'write': []}
+    failures = {'read': 0, 'write': 0}
+    lock = threading.Lock()
+
+    def run(thread_id):
+        rng = random.Random(worker_id * 1000 + thread_id)
+        n = 0
+        while time.monotonic() < deadline:
+            n += 1
+            started = time.perf_counter()
+            if rng.random() < args.write_ratio:
+                kind = 'write'
+                email = f'w{worker_id}-t{thread_id}-{n}@example.com'
+                if n % 2:
+                    response = client.post('/api/subscribe', json={'email': email, 'name': 'Bench'})
+                else:
+                    response = client.post('/api/contact', json={
+                        'name': 'Bench', 'email': email, 'subject': 'Hello',
+                        'message': 'Benchmark message', 'subscribe_to_newsletter': True,
+                    })
+            else:
+                kind = 'read'
+                response = client.get(rng.choice(READS))
+            elapsed = time.perf_counter() - started
+            with lock:
+                samples[kind].append(elapsed)
+                if response.status_code >= 500:
+                    failures[kind] += 1
+
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(args.threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    results.put({'samples': samples, 'failures': failures, 'locked': log.getvalue().count('database is locked')})
+
+
+def run_mode(args):
+    """Seed a fresh database, run the forked workers, print one JSON summary line"""
+    os.environ['RESPONSE_CACHE_ENABLED'] = 'False'
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_seeded_app(args.projects)
+    # Keep email delivery (SMTP, DNS lookups) out of the measurement
+    from routes import public_routes
+    for name in ('send_welcome_email', 'send_new_subscriber_notification',
+                 'send_contact_message_email', 'send_contact_confirmation_email'):
+        setattr(public_routes, name, lambda *args, **kwargs: True)
+
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(app, i, args, results)) for i in range(args.workers)]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    summary = {}
+    for kind in ('read', 'write'):
+        latencies = sorted(s for result in collected for s in result['samples'][kind])
+        summary[kind] = {
+            'requests': len(latencies),
+            'failed': sum(result['failures'][kind] for result in collected),
+            'p50_ms': statistics.median(latencies) * 1000 if latencies else None,
+            'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else None,
+        }
+    summary['locked'] = sum(result['locked'] for result in collected)
+    print(json.dumps(summary))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--write-ratio', type=float, default=0.3)
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--run', choices=['profile', 'stock'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        os.environ['SQLITE_PROFILE_ENABLED'] = str(args.run == 'profile')
+        run_mode(args)
+        return
+
+    print(f"{args.workers} workers x {args.threads} threads, {args.duration:.0f}s, "
+          f"{args.write_ratio:.0%} writes")
+    print(f"\n{'settings':<9} {'kind':<6} {'req/s':>7} {'failed':>7} {'p50 ms':>8} {'p99 ms':>8}  locked errors")
+    for mode in ('stock', 'profile'):
+        # A fresh process per mode: the SQLite settings are read when the app is imported
+        output = subprocess.run(
+            [sys.executable, __file__, '--run', mode] + sys.argv[1:],
+            capture_output=True, text=True, check=True
+        ).stdout
+        summary = json.loads(output.strip().splitlines()[-1])
+        for kind in ('read', 'write'):
+            row = summary[kind]
+            p50 = f"{row['p50_ms']:.1f}" if row['p50_ms'] is not None else '-'
+            p99 = f"{row['p99_ms']:.1f}" if row['p99_ms'] is not None else '-'
+            locked = summary['locked'] if kind == 'read' else ''
+            print(f"{mode:<9} {kind:<6} {row['requests'] / args.duration:>7.0f} {row['failed']:>7} "
+                  f"{p50:>8} {p99:>8}  {locked}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Many concurrent /api/stream subscribers: how many receive a change, how fast,
+and whether a reconnect with Last-Event-ID resumes without losing events.
+
+Runs the gevent sidecar (gunicorn_stream.conf.py) by default, i.e. a single
+worker process serving every subscriber; --server werkzeug uses the threaded
+development server instead.
+
+    python benchmarks/sse_subscribers.py [--subscribers 300] [--server gunicorn|werkzeug]
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from common import BACKEND_DIR, create_seeded_app, wait_for_server
+
+
+def start_server(app, kind, port):
+    if kind == 'werkzeug':
+        from werkzeug.serving import WSGIRequestHandler, make_server
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_request(self, *args, **kwargs):
+                pass
+
+        server = make_server('127.0.0.1', port, app, threaded=True, request_handler=QuietHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server.shutdown
+    env = dict(os.environ, STREAM_PORT=str(port))
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn_stream.conf.py', '--log-level', 'warning', 'app:app'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return process.terminate
+
+
+class Subscriber(threading.Thread):
+    """Reads /api/stream until it has seen `expected` change events"""
+
+    def __init__(self, port, expected=1, last_event_id=None):
+        super().__init__(daemon=True)
+        self.port = port
+        self.expected = expected
+        self.last_event_id = last_event_id
+        self.ready = threading.Event()
+        self.events = []
+        self.error = None
+
+    def run(self):
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=60)
+            headers = {'Accept': 'text/event-stream'}
+            if self.last_event_id is not None:
+                headers['Last-Event-ID'] = str(self.last_event_id)
+            conn.request('GET', '/api/stream', headers=headers)
+            response = conn.getresponse()
+            data = None
+            while len(self.events) < self.expected:
+                line = response.readline().decode('utf-8')
+                if not line:
+                    break
+                if line.startswith('retry:'):
+                    self.ready.set()
+                elif line.startswith('data:'):
+                    data = json.loads(line[5:])
+                elif line == '\n' and data is not None:
+                    self.events.append((time.monotonic(), data))
+                    data = None
+            conn.close()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.ready.set()
+
+
+def commit_change(app, title):
+    from models import db, Project
+    with app.app_context():
+        project = Project.query.order_by(Project.id.asc()).first()
+        project.title = title
+        db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--subscribers', type=int, default=300)
+    parser.add_argument('--server', choices=['gunicorn', 'werkzeug'], default='gunicorn')
+    parser.add_argument('--port', type=int, default=5099)
+    args = parser.parse_args()
+
+    app = create_seeded_app(projects=20)
+    stop = start_server(app, args.server, args.port)
+    try:
+        wait_for_server(args.port)
+
+        subscribers = [Subscriber(args.port) for _ in range(args.subscribers)]
+        started = time.monotonic()
+        for subscriber in subscribers:
+            subscriber.start()
+        for subscriber in subscribers:
+            subscriber.ready.wait(30)
+        print(f"{args.subscribers} subscribers connected in {time.monotonic() - started:.2f}s ({args.server})")
+
+        committed_at = time.monotonic()
+        commit_change(app, 'Renamed while streaming')
+        for subscriber in subscribers:
+            subscriber.join(30)
+
+        latencies = [s.events[0][0] - committed_at for s in subscribers if s.events]
+        errors = [s.error for s in subscribers if s.error]
+        print(f"received: {len(latencies)}/{args.subscribers}, errors: {len(errors)}")
+        if latencies:
+            latencies.sort()
+            print(f"latency ms: p50 {statistics.median(latencies) * 1000:.0f}, "
+                  f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f}, "
+                  f"max {latencies[-1] * 1000:.0f}")
+
+        # Resume: a change made while disconnected arrives after reconnecting
+        first_version = subscribers[0].events[0][1]['version'] if subscribers[0].events else 0
+        commit_change(app, 'Renamed while disconnected')
+        resumed = Subscriber(args.port, last_event_id=first_version)
+        resumed.start()
+        resumed.join(30)
+        ok = bool(resumed.events) and resumed.events[0][1]['version'] > first_version
+        print(f"resume from Last-Event-ID {first_version}: {'ok' if ok else 'FAILED'}")
+    finally:
+        stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""
+Mixed read/write load against a local gunicorn server, once per worker
+profile of gunicorn.conf.py (GUNICORN_PROFILE): throughput and p50/p99
+latency of uncached public reads and of /api/subscribe and /api/contact
+writes. The writes send their emails to a local SMTP sink that answers after
+--smtp-delay seconds, like a slow mail provider.
+
+Every profile starts from a copy of the same seeded database and runs the
+same closed-loop load: --clients connections, split across client processes,
+each sending its next request as soon as the previous one is answered.
+
+    python benchmarks/worker_profiles.py [--profiles gthread gevent sync] [--clients 32] [--duration 15]
+"""
+import argparse
+import contextlib
+import http.client
+import io
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import socketserver
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from common import BACKEND_DIR, create_seeded_app, wait_for_server
+
+READS = ['/api/projects?limit=20', '/api/projects?fields=full&limit=5', '/api/portfolio/changes?since=0']
+
+
+class SlowSMTPHandler(socketserver.StreamRequestHandler):
+    """Accepts any message, answering the end of DATA after `delay` seconds"""
+    delay = 0.2
+
+    def reply(self, line):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        self.reply('220 localhost ESMTP benchmark')
+        in_data = False
+        for raw in self.rfile:
+            line = raw.rstrip(b'\r\n')
+            if in_data:
+                if line == b'.':
+                    in_data = False
+                    time.sleep(self.delay)
+                    self.reply('250 OK queued')
+                continue
+            command = line[:4].upper()
+            if command in (b'EHLO', b'HELO'):
+                self.reply('250 localhost')
+            elif command == b'DATA':
+                in_data = True
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+            elif command == b'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+def start_smtp_sink(delay):
+    SlowSMTPHandler.delay = delay
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), SlowSMTPHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def seed_database(projects):
+    """Seed a SQLite file once; each profile runs against its own copy"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_seeded_app(projects)
+        from models import db
+        with app.app_context():
+            db.engine.dispose()
+    return app.config['SQLALCHEMY_DATABASE_URI'].replace('sqlite:///', '', 1)
+
+
+def start_gunicorn(profile, port, database, smtp_port, args, log):
+    env = dict(
+        os.environ,
+        GUNICORN_PROFILE=profile,
+        DATABASE_URL=f'sqlite:///{database}',
+        RESPONSE_CACHE_ENABLED='False',
+        MAIL_SERVER='127.0.0.1', MAIL_PORT=str(smtp_port), MAIL_USE_TLS='False',
+        MAIL_DEFAULT_SENDER='portfolio@example.com', PORTFOLIO_OWNER_EMAIL='owner@example.com',
+    )
+    env.pop('MAIL_USERNAME', None)
+    for name, value in (('WEB_CONCURRENCY', args.workers), ('GUNICORN_THREADS', args.threads)):
+        if value:
+            env[name] = str(value)
+    return subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+         '--log-level', 'warning', '--access-logfile', os.devnull, 'app:app'],
+        cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+
+
+def client_process(port, process_id, clients, args, deadline, results):
+    samples = {'read': [], 'write': []}
+    errors = {'read': 0, 'write': 0}
+    lock = threading.Lock()
+
+    def run(client_id):
+        rng = random.Random(f'{process_id}-{client_id}')
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        n = 0
+        while time.monotonic() < deadline:
+            n += 1
+            if rng.random() < args.write_ratio:
+                kind = 'write'
+                email = f'p{process_id}-c{client_id}-{n}@example.com'
+                if n % 2:
+                    path, body = '/api/subscribe', {'email': email, 'name': 'Bench'}
+                else:
+                    path, body = '/api/contact', {
+                        'name': 'Bench', 'email': email, 'subject': 'Hello',
+                        'message': 'Benchmark message', 'subscribe_to_newsletter': False,
+                    }
+                method, headers, payload = 'POST', {'Content-Type': 'application/json'}, json.dumps(body)
+            else:
+                kind = 'read'
+                path, method, headers, payload = rng.choice(READS), 'GET', {}, None
+            started = time.perf_counter()
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                failed = response.status >= 500
+            except (OSError, http.client.HTTPException):
+                failed = True
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            elapsed = time.perf_counter() - started
+            with lock:
+                samples[kind].append(elapsed)
+                errors[kind] += failed
+        conn.close()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put({'samples': samples, 'errors': errors})
+
+
+def run_load(port, args):
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    deadline = time.monotonic() + args.duration
+    per_process = [args.clients // args.client_processes + (i < args.clients % args.client_processes)
+                   for i in range(args.client_processes)]
+    processes = [context.Process(target=client_process, args=(port, i, clients, args, deadline, results))
+                 for i, clients in enumerate(per_process) if clients]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    summary = {}
+    for kind in ('read', 'write'):
+        latencies = sorted(s for result in collected for s in result['samples'][kind])
+        summary[kind] = {
+            'requests': len(latencies),
+            'errors': sum(result['errors'][kind] for result in collected),
+            'p50_ms': statistics.median(latencies) * 1000 if latencies else None,
+            'p99_ms': latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000 if latencies else None,
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--profiles', nargs='+', choices=['gthread', 'gevent', 'sync'],
+                        default=['gthread', 'gevent', 'sync'])
+    parser.add_argument('--workers', type=int, help='WEB_CONCURRENCY (default: per profile, from the CPU count)')
+    parser.add_argument('--threads', type=int, help='GUNICORN_THREADS (default: 8)')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--client-processes', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--write-ratio', type=float, default=0.1)
+    parser.add_argument('--smtp-delay', type=float, default=0.2)
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--port', type=int, default=5098)
+    args = parser.parse_args()
+
+    seeded = seed_database(args.projects)
+    smtp = start_smtp_sink(args.smtp_delay)
+    workdir = tempfile.mkdtemp(prefix='portfolio-profiles-')
+    print(f"{args.clients} clients, {args.duration:.0f}s, {args.write_ratio:.0%} writes, "
+          f"SMTP answers after {args.smtp_delay * 1000:.0f}ms, {os.cpu_count()} CPUs")
+    print(f"\n{'profile':<8} {'kind':<6} {'req/s':>7} {'errors':>7} {'p50 ms':>8} {'p99 ms':>8}  workers")
+
+    for profile in args.profiles:
+        database = os.path.join(workdir, f'{profile}.db')
+        shutil.copy(seeded, database)
+        log_path = os.path.join(workdir, f'{profile}.log')
+        with open(log_path, 'w') as log:
+            server = start_gunicorn(profile, args.port, database, smtp.server_address[1], args, log)
+            try:
+                wait_for_server(args.port)
+                # Let every worker import the app before the clock starts
+                time.sleep(2)
+                summary = run_load(args.port, args)
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+        with open(log_path) as log:
+            output = log.read()
+        setup = next((line.split(': ', 1)[1] for line in output.splitlines() if ' profile, ' in line), '')
+        for kind in ('read', 'write'):
+            row = summary[kind]
+            p50 = f"{row['p50_ms']:.1f}" if row['p50_ms'] is not None else '-'
+            p99 = f"{row['p99_ms']:.1f}" if row['p99_ms'] is not None else '-'
+            print(f"{profile:<8} {kind:<6} {row['requests'] / args.duration:>7.0f} {row['errors']:>7} "
+                  f"{p50:>8} {p99:>8}  {setup if kind == 'read' else ''}")
+    smtp.shutdown()
+
+
+if __name__ == '__main__':
+    main()
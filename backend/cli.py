@@ -49,3 +49,222 @@ def create_admin():
     db.session.commit()
     click.echo(f'✅ Admin user {username} created successfully')
 
+@app.cli.command()
+@with_appcontext
+def rebuild_snapshots():
+    """Re-render every pre-rendered public payload (run after deploys that change serialization)"""
+    from utils.portfolio_snapshots import rebuild_snapshots as rebuild
+    from models import PortfolioSnapshot
+    
+    rebuild(db.session)
+    db.session.commit()
+    for snapshot in PortfolioSnapshot.query.order_by(PortfolioSnapshot.key.asc()).all():
+        click.echo(f"✅ {snapshot.key}: version {snapshot.version}, {len(snapshot.payload)} bytes")
+
+@app.cli.command()
+@click.option('--output', default=os.path.join(os.path.dirname(__file__), 'static_api'),
+              help='Directory to write the exported JSON files to')
+def export_static(output):
+    """Export every public endpoint to static .json/.gz/.br files"""
+    from utils.static_export import export_public_api, BROTLI_AVAILABLE
+    
+    if not BROTLI_AVAILABLE:
+        click.echo('ℹ️  brotli not installed, skipping .br files')
+    
+    result = export_public_api(app, output)
+    click.echo(f"✅ Exported to {output}: {len(result['written'])} written, "
+               f"{len(result['unchanged'])} unchanged, {len(result['removed'])} removed")
+
+@app.cli.command()
+@with_appcontext
+def rebuild_search_index():
+    """Re-index every project for full-text search"""
+    from utils.search import init_search_index, rebuild_search_index as rebuild
+    
+    backend = init_search_index()
+    count = rebuild()
+    click.echo(f'✅ Indexed {count} projects ({backend})')
+
+@app.cli.command()
+@with_appcontext
+def backfill_technologies():
+    """Rebuild the normalized project_technologies rows from each project's technologies"""
+    from utils.technologies import backfill_project_technologies
+    
+    count = backfill_project_technologies()
+    click.echo(f'✅ Indexed technologies of {count} projects')
+
+@app.cli.command()
+@with_appcontext
+def ensure_indexes():
+    """Create indexes declared on the models that the database is missing"""
+    from utils.query_plans import ensure_indexes as ensure
+    
+    created = ensure()
+    for index_name in created:
+        click.echo(f'✅ Created index {index_name}')
+    if not created:
+        click.echo('ℹ️  All indexes already exist')
+
+@app.cli.command()
+@click.option('--verbose', is_flag=True, help='Print the full plan of every query')
+@with_appcontext
+def check_query_plans(verbose):
+    """EXPLAIN the hot public queries; exits non-zero if any needs a full scan or a sort"""
+    from utils.query_plans import check_query_plans as check
+    
+    failures = 0
+    for name, lines, problems in check():
+        if problems:
+            failures += 1
+            click.echo(f'❌ {name}: ' + '; '.join(problems))
+        else:
+            click.echo(f'✅ {name}')
+        if verbose or problems:
+            for line in lines:
+                click.echo(f'     {line}')
+    if failures:
+        raise SystemExit(1)
+
+@app.cli.command()
+@click.option('--verbose', is_flag=True, help='Print every counted statement')
+@with_appcontext
+def check_query_budgets(verbose):
+    """Count the statements of building and serving /api/portfolio; exits non-zero over budget"""
+    from utils.query_plans import check_query_budgets as check
+    
+    failures = 0
+    for name, statements, budget in check():
+        if len(statements) > budget:
+            failures += 1
+            click.echo(f'❌ {name}: {len(statements)} statements (budget {budget})')
+        else:
+            click.echo(f'✅ {name}: {len(statements)} statements (budget {budget})')
+        if verbose or len(statements) > budget:
+            for sql, _ in statements:
+                click.echo(f"     {' '.join(sql.split())[:120]}")
+    if failures:
+        raise SystemExit(1)
+
+@app.cli.command()
+@click.option('--verbose', is_flag=True, help='Print every statement of each revalidation')
+@with_appcontext
+def check_conditional_requests(verbose):
+    """Revalidate the list, detail and portfolio endpoints; exits non-zero unless each is a 304 that only reads content_versions"""
+    from utils.query_plans import check_conditional_requests as check
+    
+    failures = 0
+    for path, statements, problems in check():
+        if problems:
+            failures += 1
+            click.echo(f'❌ {path}: ' + '; '.join(problems))
+        else:
+            click.echo(f'✅ {path}: 304 after {len(statements)} statements')
+        if verbose or problems:
+            for sql, _ in statements:
+                click.echo(f"     {' '.join(sql.split())[:120]}")
+    if failures:
+        raise SystemExit(1)
+
+@app.cli.command()
+def check_asgi_parity():
+    """Diff the responses of the Flask public API and the ASGI read path (asgi.py); exits non-zero on any difference"""
+    import asgi
+    from utils.asgi_parity import check_asgi_parity as check
+    
+    failures = 0
+    for name, problems in check(app, asgi):
+        if problems:
+            failures += 1
+            click.echo(f'❌ {name}: ' + '; '.join(problems))
+        else:
+            click.echo(f'✅ {name}')
+    if failures:
+        raise SystemExit(1)
+
+@app.cli.command()
+@click.option('--timeout', default=10.0, help='Seconds to wait for the event')
+def check_stream(timeout):
+    """Subscribe to /api/stream, commit a change and check the event arrives; exits non-zero if it does not"""
+    from utils.event_stream import check_stream_delivery
+    
+    delivered, seconds, events = check_stream_delivery(app, timeout)
+    if not delivered:
+        click.echo(f'❌ No event for the committed change within {timeout:.0f}s ({len(events)} other events)')
+        raise SystemExit(1)
+    click.echo(f'✅ Subscriber received the change {seconds * 1000:.0f} ms after the commit')
+
+@app.cli.command()
+@click.argument('paths', nargs=-1, required=True)
+def revalidate(paths):
+    """Send the revalidation webhooks for PATHS now (e.g. after a deploy: flask revalidate /)"""
+    from utils.revalidation import revalidation_sender
+    
+    if not revalidation_sender.urls:
+        click.echo('⚠️  REVALIDATE_WEBHOOK_URLS is not set')
+        return
+    for url in revalidation_sender.urls:
+        if revalidation_sender.deliver(url, sorted(set(paths))):
+            click.echo(f'✅ {url}: revalidated {len(set(paths))} paths')
+        else:
+            click.echo(f'❌ {url}: {revalidation_sender.last_error}')
+
+@app.cli.command()
+@click.option('--port', default=3999, help='Port to listen on')
+def revalidation_stand_in(port):
+    """Run a local HTTP server that prints the revalidation webhooks it receives"""
+    import json
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            secret = self.headers.get('X-Revalidate-Secret')
+            click.echo(f'🔄 {self.path} secret={secret!r} {body.decode("utf-8")}')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps({'revalidated': True}).encode('utf-8'))
+        
+        def log_message(self, *args):
+            pass
+    
+    click.echo(f'ℹ️  Listening on http://127.0.0.1:{port}/ (set REVALIDATE_WEBHOOK_URLS to it)')
+    HTTPServer(('127.0.0.1', port), Handler).serve_forever()
+
+@app.cli.command()
+def replica_status():
+    """Compare the read replica with the primary and print the routing state"""
+    from utils.read_replica import replica_router
+    
+    if not replica_router.enabled:
+        click.echo('ℹ️  No read replica configured (set DATABASE_REPLICA_URL)')
+        return
+    replica_router.check()
+    stats = replica_router.stats()
+    if stats['healthy']:
+        click.echo(f"✅ Replica in rotation (lag {stats['lag']:.1f}s)")
+    elif stats['last_error']:
+        click.echo(f"❌ Replica unavailable: {stats['last_error']}")
+    else:
+        lag = 'unknown' if stats['lag'] is None else f"{stats['lag']:.1f}s"
+        click.echo(f"⚠️  Replica lagging (lag {lag}, max {stats['max_lag']}s); reads use the primary")
+
+@app.cli.command()
+def sync_sqlite_replica():
+    """Copy the SQLite primary onto the SQLite replica (local stand-in for replication)"""
+    import sqlite3
+    from models.session import REPLICA_BIND
+    
+    primary, replica = db.engines[None], db.engines.get(REPLICA_BIND)
+    if replica is None or primary.dialect.name != 'sqlite' or replica.dialect.name != 'sqlite':
+        click.echo('❌ Both DATABASE_URL and DATABASE_REPLICA_URL must be SQLite files')
+        return
+    source = sqlite3.connect(primary.url.database)
+    target = sqlite3.connect(replica.url.database)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+    click.echo(f'✅ Copied {primary.url.database} to {replica.url.database}')
@@ -1,4 +1,23 @@
-"""Gunicorn configuration file"""
+"""
+Gunicorn configuration file
+
+The worker profile is chosen with GUNICORN_PROFILE:
+
+- gthread (default): WEB_CONCURRENCY processes (default: one per CPU, at least
+  2), each serving GUNICORN_THREADS requests at once (default 8). A slow SMTP
+  send or a large upload holds one thread, not a whole worker.
+- gevent: WEB_CONCURRENCY processes (default: one per CPU, at least 2), each
+  serving up to GUNICORN_WORKER_CONNECTIONS requests as greenlets (default
+  1000). The worker monkey-patches the standard library before loading the
+  app, so Flask-Mail (smtplib), Redis and HTTP clients yield while waiting on
+  the network, and psycopg2 is switched to gevent's wait callback (see
+  utils.db_engines). GUNICORN_THREADS then only sizes the database pool.
+- sync: the previous setup, one request per process; WEB_CONCURRENCY defaults
+  to 2 x CPUs + 1.
+
+`python benchmarks/worker_profiles.py` compares the profiles under mixed
+read/write load against a local server.
+"""
 import os
 
 # Get PORT from environment variable
@@ -10,12 +29,34 @@ print(f"🔍 Gunicorn config: Binding to 0.0.0.0:{port}")
 bind = f"0.0.0.0:{port}"
 
 # Worker configuration
-workers = 2
-worker_class = "sync"
-worker_connections = 1000
+profile = os.environ.get('GUNICORN_PROFILE', 'gthread').lower()
+if profile not in ('gthread', 'gevent', 'sync'):
+    print(f"⚠️  Warning: unknown GUNICORN_PROFILE '{profile}', using gthread")
+    profile = 'gthread'
+
+try:
+    cpus = len(os.sched_getaffinity(0))
+except AttributeError:
+    cpus = os.cpu_count() or 1
+
+default_workers = 2 * cpus + 1 if profile == 'sync' else max(2, cpus)
+workers = int(os.environ.get('WEB_CONCURRENCY', default_workers))
+worker_class = profile
+threads = int(os.environ.get('GUNICORN_THREADS', 8)) if profile != 'sync' else 1
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
 timeout = 30
 keepalive = 2
 
+# /api/stream holds a thread (or a sync worker) per subscriber, so it is left to
+# the gevent sidecar (gunicorn_stream.conf.py) unless these are gevent workers
+stream_enabled = os.environ.get('STREAM_ENABLED', 'true' if profile == 'gevent' else 'false')
+
+# The app sizes its database pool from these (see DB_POOL_* in app.py)
+raw_env = [f"WEB_CONCURRENCY={workers}", f"GUNICORN_THREADS={threads}", f"STREAM_ENABLED={stream_enabled}"]
+print(f"🔍 Gunicorn config: {profile} profile, {workers} workers"
+      + (f" x {threads} threads" if profile == 'gthread' else '')
+      + (f" x {worker_connections} connections" if profile == 'gevent' else ''))
+
 # Logging
 accesslog = "-"  # Log to stdout
 errorlog = "-"  # Log to stderr
@@ -35,4 +76,3 @@ tmp_upload_dir = None
 # SSL (if needed in future)
 # keyfile = None
 # certfile = None
-
@@ -0,0 +1,32 @@
+"""
+Gunicorn configuration for the Server-Sent Events sidecar
+
+Serves the same app as gunicorn.conf.py, but with gevent workers so each open
+/api/stream connection costs a greenlet instead of a whole sync worker. Route
+/api/stream to this process (e.g. an nginx location block) and everything else
+to the main server:
+
+    gunicorn -c gunicorn_stream.conf.py app:app
+"""
+import os
+
+port = os.environ.get('STREAM_PORT', '5002')
+bind = f"0.0.0.0:{port}"
+
+# One process multiplexes every subscriber; the change log is polled once per
+# worker regardless of the number of connections
+workers = int(os.environ.get('STREAM_WORKERS', 1))
+worker_class = "gevent"
+worker_connections = int(os.environ.get('STREAM_WORKER_CONNECTIONS', 2000))
+timeout = 30
+keepalive = 75
+
+# Long-lived streams are fine here; recycle them hourly
+raw_env = [f"STREAM_MAX_DURATION={os.environ.get('STREAM_MAX_DURATION', 3600)}", "STREAM_ENABLED=true"]
+
+# Logging
+accesslog = "-"
+errorlog = "-"
+loglevel = "info"
+
+proc_name = "portfolio_stream"
@@ -1,8 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()
+from .session import RoutingSession
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 from .project import Project
+from .project_technology import ProjectTechnology
 from .admin import Admin
 from .personal_info import PersonalInfo
 from .impact_metric import ImpactMetric
@@ -13,4 +16,6 @@ from .certification import Certification
 from .social_link import SocialLink
 from .subscription import Subscription
 from .contact_message import ContactMessage
-
+from .portfolio_snapshot import PortfolioSnapshot
+from .content_version import ContentVersion
+from .change_log import ChangeLogEntry
@@ -32,7 +32,7 @@ class Admin(db.Model):
             'username': self.username,
             'email': self.email,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'last_login': self.last_login.isoformat() if self.last_login else None,
+            'created_at': self.created_at,
+            'last_login': self.last_login,
         }
 
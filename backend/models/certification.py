@@ -1,9 +1,13 @@
 from . import db
+from .serialization import SerializerMixin
 from datetime import datetime
 
-class Certification(db.Model):
+class Certification(SerializerMixin, db.Model):
     """Certification model"""
     __tablename__ = 'certifications'
+    __table_args__ = (
+        db.Index('ix_certifications_order', 'order'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
@@ -13,15 +17,3 @@ class Certification(db.Model):
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        """Convert to dictionary"""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'issuer': self.issuer,
-            'order': self.order,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-        }
-
@@ -0,0 +1,33 @@
+from . import db
+from datetime import datetime
+
+class ChangeLogEntry(db.Model):
+    """
+    Latest change to each public portfolio entity. The id is the change's
+    version: it only ever grows, so clients sync with "every row after N".
+    """
+    __tablename__ = 'change_log'
+    __table_args__ = (
+        # Compaction looks up earlier rows of the same entity
+        db.Index('ix_change_log_entity_type_entity_id', 'entity_type', 'entity_id'),
+        # Never reuse the id of a compacted row on SQLite
+        {'sqlite_autoincrement': True},
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(50), nullable=False)  # Table name, e.g., "experiences"
+    entity_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)  # upsert, delete
+    
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'version': self.id,
+            'type': self.entity_type,
+            'id': self.entity_id,
+            'op': self.op,
+            'created_at': self.created_at,
+        }
@@ -22,9 +22,9 @@ class ContactMessage(db.Model):
             'email': self.email,
             'subject': self.subject,
             'message': self.message,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'created_at': self.created_at,
             'is_read': self.is_read,
-            'replied_at': self.replied_at.isoformat() if self.replied_at else None
+            'replied_at': self.replied_at
         }
     
     def __repr__(self):
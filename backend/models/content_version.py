@@ -0,0 +1,20 @@
+from . import db
+from datetime import datetime
+
+class ContentVersion(db.Model):
+    """Change counter per table, bumped by every commit that writes to the table"""
+    __tablename__ = 'content_versions'
+    
+    table_name = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    
+    # Timestamps
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'table_name': self.table_name,
+            'version': self.version,
+            'updated_at': self.updated_at,
+        }
@@ -1,9 +1,13 @@
 from . import db
+from .serialization import SerializerMixin
 from datetime import datetime
 
-class Education(db.Model):
+class Education(SerializerMixin, db.Model):
     """Education model"""
     __tablename__ = 'educations'
+    __table_args__ = (
+        db.Index('ix_educations_order', 'order'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     degree = db.Column(db.String(200), nullable=False)
@@ -15,17 +19,3 @@ class Education(db.Model):
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        """Convert to dictionary"""
-        return {
-            'id': self.id,
-            'degree': self.degree,
-            'institution': self.institution,
-            'period': self.period,
-            'type': self.type,
-            'order': self.order,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-        }
-
@@ -1,9 +1,13 @@
 from . import db
+from .serialization import SerializerMixin
 from datetime import datetime
 
-class Experience(db.Model):
+class Experience(SerializerMixin, db.Model):
     """Work experience model"""
     __tablename__ = 'experiences'
+    __table_args__ = (
+        db.Index('ix_experiences_order', 'order'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     company = db.Column(db.String(200), nullable=False)
@@ -16,18 +20,3 @@ class Experience(db.Model):
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        """Convert to dictionary"""
-        return {
-            'id': self.id,
-            'company': self.company,
-            'location': self.location,
-            'role': self.role,
-            'period': self.period,
-            'achievements': self.achievements or [],
-            'order': self.order,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-        }
-
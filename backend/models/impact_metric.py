@@ -1,9 +1,13 @@
 from . import db
+from .serialization import SerializerMixin
 from datetime import datetime
 
-class ImpactMetric(db.Model):
+class ImpactMetric(SerializerMixin, db.Model):
     """Impact metrics model"""
     __tablename__ = 'impact_metrics'
+    __table_args__ = (
+        db.Index('ix_impact_metrics_order', 'order'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     value = db.Column(db.Integer, nullable=False)
@@ -15,17 +19,3 @@ class ImpactMetric(db.Model):
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        """Convert to dictionary"""
-        return {
-            'id': self.id,
-            'value': self.value,
-            'suffix': self.suffix,
-            'label': self.label,
-            'color': self.color,
-            'order': self.order,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-        }
-
@@ -1,7 +1,8 @@
 from . import db
+from .serialization import SerializerMixin
 from datetime import datetime
 
-class PersonalInfo(db.Model):
+class PersonalInfo(SerializerMixin, db.Model):
     """Personal information model (single record)"""
     __tablename__ = 'personal_info'
     
@@ -17,19 +18,3 @@ class PersonalInfo(db.Model):
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        """Convert to dictionary"""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'title': self.title,
-            'tagline': self.tagline,
-            'email': self.email,
-            'phone': self.phone,
-            'location': self.location,
-            'profile_image': self.profile_image,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-        }
-
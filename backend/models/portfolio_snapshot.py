@@ -0,0 +1,22 @@
+from . import db
+from datetime import datetime
+
+class PortfolioSnapshot(db.Model):
+    """Pre-rendered public payload, shared by every worker"""
+    __tablename__ = 'portfolio_snapshots'
+    
+    key = db.Column(db.String(100), primary_key=True)  # e.g., 'portfolio', 'experiences'
+    version = db.Column(db.Integer, nullable=False, default=1)  # Bumped on every rebuild
+    payload = db.Column(db.LargeBinary, nullable=False)  # Encoded JSON body
+    
+    # Timestamps
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert to dictionary (without the payload)"""
+        return {
+            'key': self.key,
+            'version': self.version,
+            'size': len(self.payload) if self.payload else 0,
+            'updated_at': self.updated_at,
+        }
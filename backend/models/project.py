@@ -1,9 +1,22 @@
+from sqlalchemy import case, event, func
+from sqlalchemy.orm import object_session
+
 from . import db
+from .serialization import SerializerMixin
+from .project_technology import ProjectTechnology, technology_slug, parse_technologies
 from datetime import datetime
 
-class Project(db.Model):
+class Project(SerializerMixin, db.Model):
     """Project model for portfolio projects"""
     __tablename__ = 'projects'
+    __table_args__ = (
+        # Keyset pagination: newest first, public (published only) and admin lists
+        db.Index('ix_projects_status_created_at_id', 'status', 'created_at', 'id'),
+        db.Index('ix_projects_created_at_id', 'created_at', 'id'),
+        # Public list filtered by featured / category, same ordering
+        db.Index('ix_projects_status_featured_created_at_id', 'status', 'featured', 'created_at', 'id'),
+        db.Index('ix_projects_status_category_created_at_id', 'status', 'category', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -33,25 +46,84 @@ class Project(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def to_dict(self):
-        """Convert project to dictionary"""
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'short_description': self.short_description,
-            'thumbnail_image': self.thumbnail_image,
-            'screenshots': self.screenshots or [],
-            'video_url': self.video_url,
-            'video_file': self.video_file,
-            'live_link': self.live_link,
-            'github_link': self.github_link,
-            'demo_link': self.demo_link,
-            'technologies': self.technologies or [],
-            'category': self.category,
-            'featured': self.featured,
-            'status': self.status,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-        }
+    # Normalized copy of `technologies`, kept in sync on every assignment (see below)
+    technology_links = db.relationship(
+        ProjectTechnology, cascade='all, delete-orphan', lazy='select'
+    )
+    
+    # Serialized fields, in output order
+    FIELDS = (
+        'id', 'title', 'description', 'short_description', 'thumbnail_image', 'screenshots',
+        'video_url', 'video_file', 'live_link', 'github_link', 'demo_link', 'technologies',
+        'category', 'featured', 'status', 'created_at', 'updated_at',
+    )
+    # Lightweight projection for listing pages (cards): no long description or media
+    CARD_FIELDS = (
+        'id', 'title', 'short_description', 'thumbnail_image', 'live_link', 'github_link',
+        'demo_link', 'technologies', 'category', 'featured', 'status', 'created_at', 'updated_at',
+    )
+    # Named projections usable in ?fields=
+    PROJECTIONS = {'card': CARD_FIELDS, 'full': FIELDS}
+    # Length of the description excerpt standing in for an empty short_description
+    EXCERPT_LENGTH = 300
+    
+    @classmethod
+    def select_column(cls, name, fields):
+        """
+        Without the description (e.g. the card projection), an empty
+        short_description is filled in SQL with the start of the description,
+        so list cards always have a blurb but never receive the whole text
+        """
+        column = super().select_column(name, fields)
+        if name == 'short_description' and 'description' not in fields:
+            return case(
+                (func.coalesce(func.trim(column), '') == '',
+                 func.substr(cls.__table__.c.description, 1, cls.EXCERPT_LENGTH)),
+                else_=column
+            ).label(name)
+        return column
+    
+    @classmethod
+    def parse_fields(cls, value, default=CARD_FIELDS):
+        """
+        Resolve a ?fields= value (comma separated field and projection names,
+        e.g. "card,description") into a tuple of fields. Raises ValueError for
+        unknown names.
+        """
+        if not value:
+            return default
+        fields = ['id']
+        for name in (part.strip() for part in value.split(',')):
+            if not name:
+                continue
+            if name in cls.PROJECTIONS:
+                fields.extend(cls.PROJECTIONS[name])
+            elif name in cls.FIELDS:
+                fields.append(name)
+            else:
+                raise ValueError(f'Unknown field: {name}')
+        return tuple(field for field in cls.FIELDS if field in fields)
+
 
+@event.listens_for(Project.technologies, 'set', retval=True)
+def _sync_technology_links(project, value, oldvalue, initiator):
+    """
+    Store technologies as a list, however it was sent (the admin forms send a
+    JSON string), and rebuild the normalized association rows from it. Runs
+    on every assignment, including Project(technologies=...) in seed scripts.
+    """
+    technologies = parse_technologies(value)
+    session = object_session(project)
+    if session is not None:
+        with session.no_autoflush:
+            existing = {link.slug: link for link in project.technology_links}
+    else:
+        existing = {link.slug: link for link in project.technology_links}
+    links = {}
+    for name in technologies:
+        slug = technology_slug(name)[:100]
+        if slug not in links:
+            links[slug] = existing.get(slug) or ProjectTechnology(slug=slug, name=name[:100])
+    # Rows for slugs that stay are reused, so no delete + insert of the same key
+    project.technology_links = list(links.values())
+    return technologies
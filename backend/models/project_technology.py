@@ -0,0 +1,40 @@
+from . import db
+import json
+import re
+
+def technology_slug(name):
+    """Case-folded, whitespace-normalized key for a technology name ("Node JS" -> "node-js")"""
+    return re.sub(r'\s+', '-', str(name).strip().casefold())
+
+def parse_technologies(value):
+    """Technologies as a list, whether sent as a JSON array, a JSON string or "a, b, c" form data"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            value = value.split(',')
+        if isinstance(value, str):
+            value = [value]
+    return [name.strip() for name in value if isinstance(name, str) and name.strip()]
+
+class ProjectTechnology(db.Model):
+    """Normalized project <-> technology association, indexed for filtering"""
+    __tablename__ = 'project_technologies'
+    __table_args__ = (
+        # Filtering by technology: slug first, covering the project id
+        db.Index('ix_project_technologies_slug_project_id', 'slug', 'project_id'),
+    )
+    
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    slug = db.Column(db.String(100), primary_key=True)  # e.g., "react", "node.js"
+    name = db.Column(db.String(100), nullable=False)  # As entered, e.g., "React"
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'project_id': self.project_id,
+            'slug': self.slug,
+            'name': self.name,
+        }
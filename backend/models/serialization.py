@@ -0,0 +1,90 @@
+"""
+Serializers built from column definitions
+
+Public list endpoints select plain rows with Core statements instead of loading
+ORM objects, and turn each row into a dict with a function built once per
+(model, fields) from the model's columns. Model.to_dict() goes through the same
+function, so a new column shows up in both paths without touching either.
+"""
+from functools import lru_cache
+
+from sqlalchemy import JSON, select
+
+from . import db
+
+
+def _json_array(value):
+    return value or []
+
+
+@lru_cache(maxsize=None)
+def row_serializer(model, fields):
+    """
+    Function turning a row whose first values are `fields` (in that order) into
+    the model's public dict. JSON columns hold arrays and serialize NULL as [].
+    """
+    columns = model.__table__.columns
+    # (field, converter) for the values that are not serialized as read
+    converters = tuple(
+        (field, _json_array) for field in fields if isinstance(columns[field].type, JSON)
+    )
+
+    def serialize(row):
+        # zip() stops after `fields`, skipping any extra columns (e.g. a pagination key)
+        item = dict(zip(fields, row))
+        for field, convert in converters:
+            item[field] = convert(item[field])
+        return item
+
+    def serialize_as_read(row):
+        return dict(zip(fields, row))
+
+    return serialize if converters else serialize_as_read
+
+
+def fetch_rows(statement, session=None):
+    """
+    Execute a Core select on the connection of `session` (db.session by
+    default; same transaction) and return plain rows, skipping the ORM result
+    layer
+    """
+    return (session or db.session).connection().execute(statement).all()
+
+
+class SerializerMixin:
+    """to_dict() and Core selects for models serialized column by column"""
+
+    # Serialized fields in output order; every column when None
+    FIELDS = None
+
+    @classmethod
+    def serialized_fields(cls):
+        if cls.FIELDS is None:
+            cls.FIELDS = tuple(column.key for column in cls.__table__.columns)
+        return cls.FIELDS
+
+    @classmethod
+    def select_rows(cls, fields=None, *extra):
+        """
+        Core select of `fields` (all serialized fields by default), followed by
+        any `extra` columns not already selected, e.g. a pagination key
+        """
+        fields = fields or cls.serialized_fields()
+        names = list(fields) + [name for name in extra if name not in fields]
+        return select(*[cls.select_column(name, fields) for name in names])
+
+    @classmethod
+    def select_column(cls, name, fields):
+        """What select_rows(fields) selects for `name`: its column by default"""
+        return cls.__table__.c[name]
+
+    @classmethod
+    def serialize_rows(cls, rows, fields=None):
+        """Dicts for rows selected by select_rows(fields, ...)"""
+        serialize = row_serializer(cls, tuple(fields or cls.serialized_fields()))
+        return [serialize(row) for row in rows]
+
+    def to_dict(self, fields=None):
+        """Convert to dictionary (only `fields`, so deferred columns are never loaded)"""
+        fields = tuple(fields or self.serialized_fields())
+        return row_serializer(type(self), fields)([getattr(self, field) for field in fields])
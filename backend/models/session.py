@@ -0,0 +1,45 @@
+"""
+Session that can send a request's reads to the read replica
+
+When DATABASE_REPLICA_URL is set, the replica is the 'replica' bind
+(SQLALCHEMY_BINDS) and utils.read_replica decides, per request, whether reads
+may use it (flask.g.read_replica). Everything else goes to the primary: flushes,
+Core INSERT/UPDATE/DELETE, and every read made by a session after it wrote or
+was pinned with use_primary(), so a transaction always reads its own writes.
+"""
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase
+
+REPLICA_BIND = 'replica'
+
+
+class RoutingSession(Session):
+    """db.session class routing reads to the replica bind when allowed"""
+
+    def use_primary(self):
+        """Send this session's remaining statements to the primary"""
+        self.info['use_primary'] = True
+
+    def reads_from_replica(self):
+        return (
+            has_request_context() and g.get('read_replica', False)
+            and not self.info.get('use_primary') and not self._flushing
+        )
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and isinstance(clause, UpdateBase):
+            self.use_primary()
+            self.info['wrote'] = True
+        elif bind is None and self.reads_from_replica():
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _pin_writers_to_primary(session, flush_context, instances):
+    session.use_primary()
+    session.info['wrote'] = True
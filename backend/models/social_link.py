@@ -1,9 +1,13 @@
 from . import db
+from .serialization import SerializerMixin
 from datetime import datetime
 
-class SocialLink(db.Model):
+class SocialLink(SerializerMixin, db.Model):
     """Social links model"""
     __tablename__ = 'social_links'
+    __table_args__ = (
+        db.Index('ix_social_links_order', 'order'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)  # GitHub, LinkedIn, etc.
@@ -14,16 +18,3 @@ class SocialLink(db.Model):
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        """Convert to dictionary"""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'url': self.url,
-            'icon': self.icon,
-            'order': self.order,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-        }
-
@@ -19,9 +19,9 @@ class Subscription(db.Model):
             'id': self.id,
             'email': self.email,
             'name': self.name,
-            'subscribed_at': self.subscribed_at.isoformat() if self.subscribed_at else None,
+            'subscribed_at': self.subscribed_at,
             'is_active': self.is_active,
-            'unsubscribed_at': self.unsubscribed_at.isoformat() if self.unsubscribed_at else None,
+            'unsubscribed_at': self.unsubscribed_at,
             'source': self.source
         }
     
@@ -1,9 +1,13 @@
 from . import db
+from .serialization import SerializerMixin
 from datetime import datetime
 
-class TechnicalSkill(db.Model):
+class TechnicalSkill(SerializerMixin, db.Model):
     """Technical skills model"""
     __tablename__ = 'technical_skills'
+    __table_args__ = (
+        db.Index('ix_technical_skills_category_order', 'category', 'order'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
@@ -13,15 +17,3 @@ class TechnicalSkill(db.Model):
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        """Convert to dictionary"""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'category': self.category,
-            'order': self.order,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-        }
-
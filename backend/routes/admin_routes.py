@@ -11,6 +11,12 @@ from models import (
 )
 from models.admin import bcrypt
 from utils.file_upload import save_image, save_video, delete_file
+from utils.response_cache import response_cache
+from utils.revalidation import revalidation_sender
+from utils.compression import compression_cache
+from utils.binary_formats import stats as binary_format_stats
+from utils.pagination import MAX_PAGE_SIZE, page_size, paginate_keyset
+from utils.db_engines import pool_stats
 
 # Admin Authentication
 @admin_bp.route('/login', methods=['POST'])
@@ -55,13 +61,50 @@ def get_current_admin():
     
     return jsonify(admin.to_dict()), 200
 
+@admin_bp.route('/cache/stats', methods=['GET'])
+@jwt_required()
+def get_cache_stats():
+    """Public response and compression cache counters"""
+    return jsonify({
+        'responses': response_cache.stats(),
+        'compression': compression_cache.stats(),
+        'binary_formats': binary_format_stats(),
+        'revalidation': revalidation_sender.stats()
+    }), 200
+
+@admin_bp.route('/db/pool', methods=['GET'])
+@jwt_required()
+def get_pool_stats():
+    """Connection pool state and counters of this worker's database engines"""
+    return jsonify(pool_stats()), 200
+
 # Project Management
 @admin_bp.route('/projects', methods=['GET'])
 @jwt_required()
 def get_all_projects():
-    """Get all projects (admin view - includes drafts)"""
-    projects = Project.query.order_by(Project.created_at.desc()).all()
-    return jsonify([project.to_dict() for project in projects]), 200
+    """
+    Get projects, newest first (admin view - includes drafts).
+    Paged with ?limit= and ?cursor=; the cursors of the neighbouring pages are
+    returned in the X-Next-Cursor / X-Prev-Cursor headers. Returns the card
+    projection unless ?fields= asks for more.
+    """
+    limit = page_size(request.args.get('limit', type=int), default=MAX_PAGE_SIZE)
+    
+    try:
+        fields = Project.parse_fields(request.args.get('fields'))
+        rows, next_cursor, prev_cursor = paginate_keyset(
+            Project.select_rows(fields, 'created_at', 'id'), (Project.created_at, Project.id),
+            limit, request.args.get('cursor')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    response = jsonify(Project.serialize_rows(rows, fields))
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    if prev_cursor:
+        response.headers['X-Prev-Cursor'] = prev_cursor
+    return response, 200
 
 @admin_bp.route('/projects', methods=['POST'])
 @jwt_required()
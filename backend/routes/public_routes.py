@@ -1,9 +1,9 @@
-from flask import jsonify, send_from_directory, request
+from flask import Response, abort, jsonify, send_from_directory, request
 import os
 
 from routes import public_bp
 from models import (
-    Project, PersonalInfo, ImpactMetric, TechnicalSkill,
+    Project, ProjectTechnology, PersonalInfo, ImpactMetric, TechnicalSkill,
     Experience, Education, Certification, SocialLink, Subscription, ContactMessage
 )
 from models import db
@@ -13,6 +13,21 @@ from utils.email_service import (
     send_contact_message_email,
     send_contact_confirmation_email
 )
+from utils.response_cache import cached_response
+from utils.portfolio_snapshots import get_snapshot, snapshot_response
+from utils.compression import compress_response
+from utils.binary_formats import negotiate_format
+from utils import public_reads
+from utils.change_log import LOGGED_MODELS, changes_since
+from utils.event_stream import change_broadcaster
+from utils.read_replica import replica_router
+
+# after_request hooks run last-registered first: re-encode, then compress
+public_bp.after_request(compress_response)
+public_bp.after_request(negotiate_format)
+
+# GET requests read from the replica when one is configured and caught up
+replica_router.route_reads(public_bp)
 
 @public_bp.route('/health', methods=['GET'])
 def health_check():
@@ -20,46 +35,70 @@ def health_check():
     return jsonify({"status": "healthy", "message": "Flask backend is running"})
 
 @public_bp.route('/projects', methods=['GET'])
+@cached_response(Project)
 def get_projects():
-    """Get all published projects (public endpoint)"""
-    # Query parameters
-    featured = request.args.get('featured', type=bool)
-    category = request.args.get('category')
-    limit = request.args.get('limit', type=int, default=50)
-    
-    query = Project.query.filter_by(status='published')
-    
-    if featured:
-        query = query.filter_by(featured=True)
-    
-    if category:
-        query = query.filter_by(category=category)
+    """
+    Get published projects, newest first, one page at a time (public endpoint).
+    Returns the lightweight card projection unless ?fields= asks for more.
+    ?tech=react&tech=flask filters by technology (?tech_match=any for OR).
+    """
+    try:
+        payload = public_reads.project_page(
+            db.session,
+            fields=request.args.get('fields'),
+            featured=request.args.get('featured', type=bool),
+            category=request.args.get('category'),
+            technologies=request.args.getlist('tech'),
+            tech_match=request.args.get('tech_match', 'all'),
+            limit=request.args.get('limit', type=int),
+            cursor=request.args.get('cursor'),
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    projects = query.order_by(Project.created_at.desc()).limit(limit).all()
+    return jsonify(payload), 200
+
+@public_bp.route('/projects/facets', methods=['GET'])
+@cached_response(Project, ProjectTechnology)
+def get_project_facets():
+    """Counts of published projects per category, technology and featured flag (pre-rendered)"""
+    return snapshot_response(get_snapshot('projects-facets'))
+
+@public_bp.route('/projects/search', methods=['GET'])
+@cached_response(Project)
+def search_projects():
+    """
+    Full-text search over published projects, best match first.
+    Supports the same ?limit=, ?cursor= and ?fields= parameters as /projects;
+    each project also carries a highlighted `snippet`.
+    """
+    try:
+        payload = public_reads.project_search(
+            db.session,
+            request.args.get('q', ''),
+            fields=request.args.get('fields'),
+            limit=request.args.get('limit', type=int),
+            cursor=request.args.get('cursor'),
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify({
-        'count': len(projects),
-        'projects': [project.to_dict() for project in projects]
-    }), 200
+    return jsonify(payload), 200
 
 @public_bp.route('/projects/<int:project_id>', methods=['GET'])
+@cached_response(Project)
 def get_project(project_id):
     """Get a specific published project"""
-    project = Project.query.filter_by(id=project_id, status='published').first_or_404()
-    return jsonify(project.to_dict()), 200
+    project = public_reads.published_project(db.session, project_id)
+    if project is None:
+        abort(404)
+    return jsonify(project), 200
 
 @public_bp.route('/projects/featured', methods=['GET'])
+@cached_response(Project)
 def get_featured_projects():
     """Get featured projects"""
-    projects = Project.query.filter_by(
-        status='published',
-        featured=True
-    ).order_by(Project.created_at.desc()).limit(6).all()
-    
-    return jsonify({
-        'count': len(projects),
-        'projects': [project.to_dict() for project in projects]
-    }), 200
+    return snapshot_response(get_snapshot('projects-featured'))
 
 @public_bp.route('/uploads/<path:filename>')
 def uploaded_file(filename):
@@ -69,73 +108,98 @@ def uploaded_file(filename):
 
 # ==================== Public Portfolio Data Endpoints ====================
 @public_bp.route('/personal-info', methods=['GET'])
+@cached_response(PersonalInfo)
 def get_personal_info():
     """Get personal information"""
-    info = PersonalInfo.query.first()
-    if not info:
+    snapshot = get_snapshot('personal-info')
+    if snapshot.payload.strip() == b'null':
         return jsonify({'error': 'Personal info not found'}), 404
-    return jsonify(info.to_dict()), 200
+    return snapshot_response(snapshot)
 
 @public_bp.route('/impact-metrics', methods=['GET'])
+@cached_response(ImpactMetric)
 def get_impact_metrics():
     """Get all impact metrics"""
-    metrics = ImpactMetric.query.order_by(ImpactMetric.order.asc()).all()
-    return jsonify([m.to_dict() for m in metrics]), 200
+    return snapshot_response(get_snapshot('impact-metrics'))
 
 @public_bp.route('/technical-skills', methods=['GET'])
+@cached_response(TechnicalSkill)
 def get_technical_skills():
     """Get all technical skills grouped by category"""
-    skills = TechnicalSkill.query.order_by(TechnicalSkill.category.asc(), TechnicalSkill.order.asc()).all()
-    
-    # Group by category
-    grouped = {}
-    for skill in skills:
-        if skill.category not in grouped:
-            grouped[skill.category] = []
-        grouped[skill.category].append(skill.name)
-    
-    return jsonify(grouped), 200
+    return snapshot_response(get_snapshot('technical-skills'))
 
 @public_bp.route('/experiences', methods=['GET'])
+@cached_response(Experience)
 def get_experiences():
     """Get all experiences"""
-    experiences = Experience.query.order_by(Experience.order.asc()).all()
-    return jsonify([e.to_dict() for e in experiences]), 200
+    return snapshot_response(get_snapshot('experiences'))
 
 @public_bp.route('/educations', methods=['GET'])
+@cached_response(Education)
 def get_educations():
     """Get all educations"""
-    educations = Education.query.order_by(Education.order.asc()).all()
-    return jsonify([e.to_dict() for e in educations]), 200
+    return snapshot_response(get_snapshot('educations'))
 
 @public_bp.route('/certifications', methods=['GET'])
+@cached_response(Certification)
 def get_certifications():
     """Get all certifications"""
-    certifications = Certification.query.order_by(Certification.order.asc()).all()
-    return jsonify([c.to_dict() for c in certifications]), 200
+    return snapshot_response(get_snapshot('certifications'))
 
 @public_bp.route('/social-links', methods=['GET'])
+@cached_response(SocialLink)
 def get_social_links():
     """Get all social links"""
-    links = SocialLink.query.order_by(SocialLink.order.asc()).all()
-    return jsonify([l.to_dict() for l in links]), 200
+    return snapshot_response(get_snapshot('social-links'))
 
 @public_bp.route('/portfolio', methods=['GET'])
+@cached_response(
+    PersonalInfo, ImpactMetric, TechnicalSkill, Experience,
+    Education, Certification, SocialLink, Project,
+    stale_while_revalidate=True
+)
 def get_full_portfolio():
-    """Get complete portfolio data in one request"""
-    return jsonify({
-        'personalInfo': PersonalInfo.query.first().to_dict() if PersonalInfo.query.first() else None,
-        'impactMetrics': [m.to_dict() for m in ImpactMetric.query.order_by(ImpactMetric.order.asc()).all()],
-        'technicalSkills': {
-            category: [s.name for s in TechnicalSkill.query.filter_by(category=category).order_by(TechnicalSkill.order.asc()).all()]
-            for category in ['core', 'frontend', 'backend', 'database', 'devops']
-        },
-        'experiences': [e.to_dict() for e in Experience.query.order_by(Experience.order.asc()).all()],
-        'educations': [e.to_dict() for e in Education.query.order_by(Education.order.asc()).all()],
-        'certifications': [c.to_dict() for c in Certification.query.order_by(Certification.order.asc()).all()],
-        'socialLinks': [l.to_dict() for l in SocialLink.query.order_by(SocialLink.order.asc()).all()],
-        'featuredProjects': [p.to_dict() for p in Project.query.filter_by(status='published', featured=True).order_by(Project.created_at.desc()).limit(6).all()],
-    }), 200
+    """Get complete portfolio data in one request (pre-rendered snapshot)"""
+    return snapshot_response(get_snapshot('portfolio'))
+
+@public_bp.route('/portfolio/changes', methods=['GET'])
+@cached_response(*LOGGED_MODELS.values())
+def get_portfolio_changes():
+    """
+    Entities upserted or deleted since ?since=<version>, oldest first.
+    ?since=0 returns every public entity; pass the returned `version` next time
+    (and again straight away while `has_more` is true).
+    """
+    since = request.args.get('since', '0')
+    if not since.isdecimal():
+        return jsonify({'error': 'since must be a non-negative integer'}), 400
+    
+    return jsonify(changes_since(int(since))), 200
+
+@public_bp.route('/stream', methods=['GET'])
+def stream_changes():
+    """
+    Server-Sent Events: one `change` event per portfolio change, with the change
+    version as the event id. Reconnecting clients resume from Last-Event-ID
+    (or ?last_event_id= for the first connection).
+    """
+    if not change_broadcaster.enabled:
+        # Each stream would hold a worker thread here; it is served by the gevent
+        # sidecar (gunicorn_stream.conf.py), which the proxy routes /api/stream to
+        return jsonify({'error': 'The change stream is not served by this server'}), 503
+    
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    if last_event_id is not None and not last_event_id.isdecimal():
+        return jsonify({'error': 'Last-Event-ID must be a change version'}), 400
+    
+    response = Response(
+        change_broadcaster.stream(int(last_event_id) if last_event_id else None),
+        mimetype='text/event-stream'
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 # ==================== Subscription Endpoints ====================
 @public_bp.route('/subscribe', methods=['POST'])
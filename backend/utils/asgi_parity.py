@@ -0,0 +1,173 @@
+"""
+Response parity between the Flask public blueprint and the ASGI read path
+
+check_asgi_parity() sends the same requests - every read endpoint, query
+parameter variants built from the database's own content, invalid input,
+binary formats, content-codings and conditional requests - to the Flask app
+(test client) and to asgi.app (called in-process), and reports every
+difference in status, body or the headers clients and caches rely on.
+"""
+import asyncio
+
+from sqlalchemy import select
+
+from models import db, Project, ProjectTechnology
+
+# Headers that must match; X-Cache (the Flask response cache) is deliberately absent
+COMPARED_HEADERS = ('Content-Type', 'Content-Encoding', 'ETag', 'Vary', 'X-Snapshot-Version')
+
+SNAPSHOT_PATHS = (
+    '/api/portfolio', '/api/personal-info', '/api/impact-metrics', '/api/technical-skills',
+    '/api/experiences', '/api/educations', '/api/certifications', '/api/social-links',
+    '/api/projects/featured', '/api/projects/facets',
+)
+
+
+def _published_sample():
+    """(a published project id, its first title word, a category, two technology slugs) or Nones"""
+    project = db.session.execute(
+        select(Project.id, Project.title, Project.category)
+        .filter_by(status='published').order_by(Project.id.asc()).limit(1)
+    ).first()
+    slugs = db.session.execute(
+        select(ProjectTechnology.slug).group_by(ProjectTechnology.slug)
+        .order_by(ProjectTechnology.slug.asc()).limit(2)
+    ).scalars().all()
+    if project is None:
+        return None, None, None, slugs
+    word = (project.title or '').split()[0] if project.title and project.title.split() else None
+    return project.id, word, project.category, slugs
+
+
+def parity_requests(flask_client):
+    """(path, query string, headers) of the requests to compare"""
+    project_id, word, category, slugs = _published_sample()
+    requests = [('/api/health', '', {})]
+    requests += [(path, '', {}) for path in SNAPSHOT_PATHS]
+    requests += [
+        ('/api/projects', '', {}),
+        ('/api/projects', 'fields=full&limit=5', {}),
+        ('/api/projects', 'featured=1&limit=5', {}),
+        ('/api/projects', 'limit=2&limit=7', {}),
+        ('/api/projects', 'fields=nope', {}),
+        ('/api/projects', 'cursor=not-a-cursor', {}),
+        ('/api/projects', 'tech=react&tech_match=some', {}),
+        ('/api/projects/search', '', {}),
+        ('/api/projects/search', 'q=zzzznotfound', {}),
+        ('/api/projects/999999999', '', {}),
+        ('/api/portfolio/changes', 'since=0', {}),
+        ('/api/portfolio/changes', 'since=-1', {}),
+        ('/api/does-not-exist', '', {}),
+    ]
+    if category:
+        requests.append(('/api/projects', f'category={category}&limit=5', {}))
+    if slugs:
+        requests.append(('/api/projects', f'tech={slugs[0]}', {}))
+        requests.append(('/api/projects', '&'.join(f'tech={slug}' for slug in slugs) + '&tech_match=any', {}))
+    if word:
+        requests.append(('/api/projects/search', f'q={word}&limit=3', {}))
+        requests.append(('/api/projects/search', f'q={word}&fields=full&limit=3', {}))
+    if project_id is not None:
+        requests.append((f'/api/projects/{project_id}', '', {}))
+
+    # Further pages, following the cursors of the Flask responses
+    first = flask_client.get('/api/projects', query_string='limit=3').get_json() or {}
+    if first.get('next_cursor'):
+        requests.append(('/api/projects', f"limit=3&cursor={first['next_cursor']}", {}))
+        second = flask_client.get('/api/projects', query_string=f"limit=3&cursor={first['next_cursor']}").get_json()
+        if second and second.get('prev_cursor'):
+            requests.append(('/api/projects', f"limit=3&cursor={second['prev_cursor']}", {}))
+
+    # Representations and conditional requests of one list and one snapshot
+    for path, query in (('/api/projects', 'limit=5'), ('/api/portfolio', '')):
+        for headers in (
+            {'Accept': 'application/msgpack'},
+            {'Accept': 'application/cbor'},
+            {'Accept-Encoding': 'gzip'},
+            {'Accept-Encoding': 'br, gzip'},
+            {'Accept': 'application/msgpack', 'Accept-Encoding': 'gzip'},
+        ):
+            requests.append((path, query, headers))
+        etag = flask_client.get(path, query_string=query).headers.get('ETag')
+        if etag:
+            requests.append((path, query, {'If-None-Match': etag}))
+            requests.append((path, query, {'If-None-Match': etag[:-1] + '-gzip"', 'Accept-Encoding': 'gzip'}))
+            requests.append((path, query, {'If-None-Match': '"outdated"'}))
+    return requests
+
+
+async def _asgi_get(asgi_app, path, query, headers):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode('ascii'),
+        'query_string': query.encode('ascii'),
+        'root_path': '',
+        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()],
+        'client': ('127.0.0.1', 0),
+        'server': ('localhost', 80),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi_app(scope, receive, send)
+    start = messages[0]
+    response_headers = {}
+    for name, value in start['headers']:
+        response_headers.setdefault(name.decode('latin-1').lower(), value.decode('latin-1'))
+    body = b''.join(message.get('body', b'') for message in messages[1:])
+    return start['status'], response_headers, body
+
+
+def _vary(value):
+    # Vary: Origin belongs to the CORS layer, which each app adds its own way
+    return ', '.join(token for token in (value or '').split(', ') if token and token != 'Origin') or None
+
+
+def _differences(flask_response, asgi_response):
+    status, headers, body = asgi_response
+    problems = []
+    if flask_response.status_code != status:
+        problems.append(f'status {flask_response.status_code} != {status}')
+    for name in COMPARED_HEADERS:
+        expected = flask_response.headers.get(name)
+        actual = headers.get(name.lower())
+        if name == 'Vary':
+            expected, actual = _vary(expected), _vary(actual)
+        if name == 'X-Snapshot-Version' and flask_response.headers.get('X-Cache') in ('HIT', 'STALE'):
+            # Response cache entries do not keep the snapshot version
+            continue
+        if expected != actual:
+            problems.append(f'{name} {expected!r} != {actual!r}')
+    if flask_response.get_data() != body:
+        problems.append(f'body differs ({len(flask_response.get_data())} vs {len(body)} bytes)')
+    return problems
+
+
+def check_asgi_parity(flask_app, asgi_module):
+    """Yield (request description, differences) for every compared request"""
+    client = flask_app.test_client()
+    requests = parity_requests(client)
+
+    async def run():
+        try:
+            return [await _asgi_get(asgi_module.app, *request) for request in requests]
+        finally:
+            await asgi_module.engine.dispose()
+
+    asgi_responses = asyncio.run(run())
+    for (path, query, headers), asgi_response in zip(requests, asgi_responses):
+        flask_response = client.get(path, query_string=query, headers=headers)
+        name = path + (f'?{query}' if query else '')
+        if headers:
+            name += ' ' + ', '.join(f'{key}: {value}' for key, value in headers.items())
+        yield name, _differences(flask_response, asgi_response)
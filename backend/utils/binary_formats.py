@@ -0,0 +1,109 @@
+"""
+MessagePack / CBOR representations of public JSON responses
+
+Clients sending `Accept: application/msgpack` (or `application/cbor`) get the
+same payload in a compact binary encoding. The JSON body - whether it came from
+the response cache or a snapshot - stays the single source: each content
+version is re-encoded once per format and kept in an LRU keyed by the JSON
+body's digest, so binary clients share every cache entry, version and ETag
+with JSON clients (the ETag gets a "-msgpack"/"-cbor" suffix).
+"""
+import hashlib
+import json
+
+from flask import request
+
+from utils.compression import DerivedBodyCache
+
+# MessagePack import (optional)
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# CBOR import (optional)
+try:
+    import cbor2
+    CBOR_AVAILABLE = True
+except ImportError:
+    CBOR_AVAILABLE = False
+
+MSGPACK_MIMETYPE = 'application/msgpack'
+CBOR_MIMETYPE = 'application/cbor'
+
+# Mimetype -> ETag suffix
+FORMAT_SUFFIXES = {MSGPACK_MIMETYPE: 'msgpack', CBOR_MIMETYPE: 'cbor'}
+
+
+def _encode(payload, mimetype):
+    if mimetype == MSGPACK_MIMETYPE:
+        return msgpack.packb(payload, use_bin_type=True)
+    return cbor2.dumps(payload)
+
+
+def available_mimetypes():
+    """Binary formats whose library is installed"""
+    mimetypes = []
+    if MSGPACK_AVAILABLE:
+        mimetypes.append(MSGPACK_MIMETYPE)
+    if CBOR_AVAILABLE:
+        mimetypes.append(CBOR_MIMETYPE)
+    return mimetypes
+
+
+binary_cache = DerivedBodyCache(max_bytes=16 * 1024 * 1024)
+
+
+def preferred_format(accept_mimetypes):
+    """The binary mimetype the client prefers to JSON (parsed Accept), or None"""
+    mimetypes = available_mimetypes()
+    if not mimetypes:
+        return None
+    # JSON first, so clients accepting anything keep getting JSON
+    mimetype = accept_mimetypes.best_match(['application/json'] + mimetypes)
+    return mimetype if mimetype in FORMAT_SUFFIXES else None
+
+
+def encode_body(body, mimetype, digest=None):
+    """
+    Return (JSON `body` re-encoded as `mimetype`, digest of that
+    representation), encoding at most once per content; `digest` identifies
+    the JSON content when the caller already knows it
+    """
+    digest = digest or hashlib.blake2b(body, digest_size=16).digest()
+    data = binary_cache.get_or_build(digest, mimetype, lambda: _encode(json.loads(body), mimetype))
+    return data, hashlib.blake2b(digest + mimetype.encode('ascii'), digest_size=16).digest()
+
+
+def negotiate_format(response):
+    """after_request hook: re-encode a JSON response when the client prefers a binary format"""
+    if (
+        request.method != 'GET'
+        or response.status_code != 200
+        or not response.is_json
+        or response.direct_passthrough
+        or response.is_streamed
+    ):
+        return response
+
+    response.vary.add('Accept')
+    mimetype = preferred_format(request.accept_mimetypes)
+    if mimetype is None:
+        return response
+
+    # The new digest identifies this representation for the compression cache
+    body, response.content_digest = encode_body(
+        response.get_data(), mimetype, getattr(response, 'content_digest', None)
+    )
+    response.set_data(body)
+    response.mimetype = mimetype
+
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{FORMAT_SUFFIXES[mimetype]}", weak)
+    return response
+
+
+def stats():
+    return {'formats': available_mimetypes(), **binary_cache.stats()}
@@ -0,0 +1,220 @@
+"""
+Storage backends for the response cache
+
+All backends store opaque bytes under string keys and share one small
+interface (get/set/add/delete/clear/stats), so the cache can be moved from a single
+process to every worker on a host (SQLite file) or every host (Redis) by
+configuration alone:
+
+    memory  per-process LRU (default; each gunicorn worker has its own copy)
+    sqlite  one SQLite file shared by all workers on a host
+    redis   any server speaking the Redis protocol, shared by every host
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Redis import (optional)
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+class MemoryBackend:
+    """In-process LRU bounded by entry count"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def add(self, key, value, ttl=None):
+        """Store value only if key is absent (or expired); True when stored"""
+        now = time.time()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and (item[1] is None or now < item[1]):
+                return False
+            self._entries[key] = (value, now + ttl if ttl else None)
+            self._entries.move_to_end(key)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': self.name,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'evictions': self.evictions,
+            }
+
+
+class SQLiteBackend:
+    """
+    Entries in a SQLite file that every worker process on the host opens.
+    WAL mode lets readers proceed while another worker writes; the oldest
+    entries are evicted once there are more than max_entries.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path, max_entries=256):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def _connection(self):
+        # One connection per thread, reopened in a forked worker
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entries ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, stored_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_cache_entries_stored_at ON cache_entries (stored_at)')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT value FROM cache_entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+            (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache_entries (key, value, expires_at, stored_at) VALUES (?, ?, ?, ?)',
+            (key, sqlite3.Binary(value), now + ttl if ttl else None, now)
+        )
+        conn.execute(
+            'DELETE FROM cache_entries WHERE key IN ('
+            'SELECT key FROM cache_entries ORDER BY stored_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+
+    def add(self, key, value, ttl=None):
+        now = time.time()
+        conn = self._connection()
+        conn.execute('DELETE FROM cache_entries WHERE key = ? AND expires_at <= ?', (key, now))
+        cursor = conn.execute(
+            'INSERT OR IGNORE INTO cache_entries (key, value, expires_at, stored_at) VALUES (?, ?, ?, ?)',
+            (key, sqlite3.Binary(value), now + ttl if ttl else None, now)
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, key):
+        self._connection().execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache_entries')
+
+    def stats(self):
+        entries = self._connection().execute('SELECT count(*) FROM cache_entries').fetchone()[0]
+        return {
+            'backend': self.name,
+            'path': self.path,
+            'entries': entries,
+            'max_entries': self.max_entries,
+        }
+
+
+class RedisBackend:
+    """
+    Entries in Redis (or anything speaking its protocol). Size is bounded by the
+    server's maxmemory policy rather than an entry count. `client` may be any
+    object with the redis-py interface, e.g. a local stand-in during development.
+    """
+
+    name = 'redis'
+
+    def __init__(self, url=None, client=None, prefix='portfolio:cache:'):
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise RuntimeError('redis is not installed')
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.url = url
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl=None):
+        if ttl:
+            self.client.set(self.prefix + key, value, px=int(ttl * 1000))
+        else:
+            self.client.set(self.prefix + key, value)
+
+    def add(self, key, value, ttl=None):
+        px = int(ttl * 1000) if ttl else None
+        return bool(self.client.set(self.prefix + key, value, nx=True, px=px))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=f'{self.prefix}*'))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self):
+        return {
+            'backend': self.name,
+            'entries': sum(1 for _ in self.client.scan_iter(match=f'{self.prefix}*')),
+        }
+
+
+def create_backend(name, max_entries=256, path=None, redis_url=None):
+    """Build the backend called `name` ('memory', 'sqlite' or 'redis')"""
+    if name == 'memory':
+        return MemoryBackend(max_entries)
+    if name == 'sqlite':
+        return SQLiteBackend(path, max_entries)
+    if name == 'redis':
+        return RedisBackend(redis_url)
+    raise ValueError(f'Unknown cache backend: {name}')
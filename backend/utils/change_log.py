@@ -0,0 +1,162 @@
+"""
+Append-only log of changes to public portfolio entities
+
+Every commit that inserts, updates or deletes a portfolio entity appends one
+change_log row per entity inside the same transaction, so a client that has
+seen version N can fetch just the entities changed since then. The log is
+compacted as it is written: an entity's earlier rows are dropped when a new one
+is appended, which keeps the log no larger than the number of entities ever
+published while every `since` version stays valid.
+"""
+from sqlalchemy import delete, event, select
+from sqlalchemy.orm import Session
+
+from models import (
+    db, ChangeLogEntry, Project, PersonalInfo, ImpactMetric, TechnicalSkill,
+    Experience, Education, Certification, SocialLink
+)
+from models.serialization import fetch_rows
+from utils.change_tracking import on_tables_committing
+
+LOGGED_MODELS = {
+    model.__tablename__: model for model in (
+        PersonalInfo, ImpactMetric, TechnicalSkill, Experience,
+        Education, Certification, SocialLink, Project
+    )
+}
+
+# Maximum number of changes returned per request
+MAX_CHANGES = 500
+
+_committed_listeners = []
+
+
+def on_changes_committed(callback):
+    """
+    Register callback(changes) to run after a commit that changed portfolio
+    entities; `changes` is a list of (entity_type, entity_id, op).
+    """
+    _committed_listeners.append(callback)
+    return callback
+
+
+def _changed_entities(session):
+    return session.info.setdefault('changed_entities', {})
+
+
+@event.listens_for(Session, 'after_flush')
+def _record_changed_entities(session, flush_context):
+    """Remember (table, id) -> op for every logged entity written by this flush"""
+    changed = _changed_entities(session)
+    for instance in list(session.new) + list(session.dirty):
+        if instance.__tablename__ in LOGGED_MODELS and session.is_modified(instance, include_collections=False):
+            changed[(instance.__tablename__, instance.id)] = 'upsert'
+    for instance in session.deleted:
+        if instance.__tablename__ in LOGGED_MODELS:
+            changed[(instance.__tablename__, instance.id)] = 'delete'
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_changed_entities(session):
+    session.info.pop('changed_entities', None)
+    session.info.pop('logged_changes', None)
+
+
+@event.listens_for(Session, 'after_commit')
+def _notify_committed_changes(session):
+    changes = session.info.pop('logged_changes', None)
+    if not changes:
+        return
+    for callback in _committed_listeners:
+        try:
+            callback(changes)
+        except Exception as e:
+            print(f"⚠️  Warning: change listener {callback.__name__} failed: {str(e)}")
+
+
+@on_tables_committing
+def _append_changes(session, tables):
+    changed = session.info.pop('changed_entities', None)
+    if not changed:
+        return
+    if session.get_bind().dialect.name == 'postgresql':
+        # Serialize writers so versions become visible in increasing order
+        session.execute(db.text(f'LOCK TABLE {ChangeLogEntry.__tablename__} IN EXCLUSIVE MODE'))
+    changes = [(entity_type, entity_id, op) for (entity_type, entity_id), op in sorted(changed.items())]
+    # Handed to on_changes_committed listeners once the commit succeeds
+    session.info['logged_changes'] = changes
+    for entity_type, entity_id, op in changes:
+        session.execute(delete(ChangeLogEntry).where(
+            ChangeLogEntry.entity_type == entity_type,
+            ChangeLogEntry.entity_id == entity_id
+        ))
+        session.add(ChangeLogEntry(entity_type=entity_type, entity_id=entity_id, op=op))
+
+
+def _is_public(entity_type, data):
+    return entity_type != Project.__tablename__ or data['status'] == 'published'
+
+
+def changes_since(since, limit=MAX_CHANGES, session=None):
+    """
+    Changes after version `since`, oldest first, with the current data of
+    every upserted entity. Entities that no longer exist or are not public
+    are reported as deleted. Reads through `session` (db.session by default).
+    """
+    entries = fetch_rows(
+        select(ChangeLogEntry.id, ChangeLogEntry.entity_type, ChangeLogEntry.entity_id, ChangeLogEntry.op)
+        .where(ChangeLogEntry.id > since)
+        .order_by(ChangeLogEntry.id.asc())
+        .limit(limit + 1),
+        session
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    # One query per entity type for the upserted rows
+    upserted = {}
+    for entry in entries:
+        if entry.op == 'upsert':
+            upserted.setdefault(entry.entity_type, []).append(entry.entity_id)
+    entities = {}
+    for entity_type, ids in upserted.items():
+        model = LOGGED_MODELS[entity_type]
+        rows = fetch_rows(model.select_rows().where(model.id.in_(ids)), session)
+        for data in model.serialize_rows(rows):
+            entities[(entity_type, data['id'])] = data
+
+    changes = []
+    for entry in entries:
+        data = entities.get((entry.entity_type, entry.entity_id))
+        change = {'version': entry.id, 'type': entry.entity_type, 'id': entry.entity_id}
+        if entry.op == 'upsert' and data is not None and _is_public(entry.entity_type, data):
+            change['op'] = 'upsert'
+            change['data'] = data
+        else:
+            change['op'] = 'delete'
+        changes.append(change)
+
+    return {
+        'since': since,
+        'version': entries[-1].id if entries else since,
+        'has_more': has_more,
+        'changes': changes,
+    }
+
+
+def backfill_change_log():
+    """Log every existing entity as upserted; returns the number of rows written"""
+    count = 0
+    for entity_type, model in LOGGED_MODELS.items():
+        for (entity_id,) in db.session.query(model.id).order_by(model.id.asc()):
+            db.session.add(ChangeLogEntry(entity_type=entity_type, entity_id=entity_id, op='upsert'))
+            count += 1
+    db.session.commit()
+    return count
+
+
+def needs_backfill():
+    """True when portfolio entities exist but the change log is still empty"""
+    if db.session.query(ChangeLogEntry.id).first():
+        return False
+    return any(db.session.query(model.id).first() for model in LOGGED_MODELS.values())
@@ -0,0 +1,74 @@
+"""
+Track which database tables each session commit writes to
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_commit_listeners = []
+_committing_listeners = []
+
+
+def on_tables_committing(callback):
+    """
+    Register callback(session, tables) to run inside the transaction, just before
+    it commits, when it wrote to one or more tables. Writes made by the callback
+    are committed atomically with the rest of the transaction; raising aborts it.
+    """
+    _committing_listeners.append(callback)
+    return callback
+
+
+def on_tables_committed(callback):
+    """
+    Register callback(tables) to run after a commit that wrote to one or more tables.
+    `tables` is a set of table names.
+    """
+    _commit_listeners.append(callback)
+    return callback
+
+
+def _touched_tables(session):
+    return session.info.setdefault('touched_tables', set())
+
+
+@event.listens_for(Session, 'after_flush')
+def _record_flushed_tables(session, flush_context):
+    """Remember the tables of every instance written by this flush"""
+    tables = _touched_tables(session)
+    for instance in list(session.new) + list(session.deleted):
+        tables.add(instance.__tablename__)
+    for instance in session.dirty:
+        if session.is_modified(instance, include_collections=False):
+            tables.add(instance.__tablename__)
+
+
+@event.listens_for(Session, 'before_commit')
+def _notify_committing_tables(session):
+    """Let listeners add their own writes to a transaction that changed tables"""
+    if not _committing_listeners:
+        return
+    session.flush()
+    tables = session.info.get('touched_tables')
+    if not tables:
+        return
+    for callback in _committing_listeners:
+        callback(session, set(tables))
+
+
+@event.listens_for(Session, 'after_commit')
+def _notify_committed_tables(session):
+    """Hand the tables written by the committed transaction to the listeners"""
+    tables = session.info.pop('touched_tables', None)
+    if not tables:
+        return
+    for callback in _commit_listeners:
+        try:
+            callback(tables)
+        except Exception as e:
+            print(f"⚠️  Warning: commit listener {callback.__name__} failed: {str(e)}")
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_rolled_back_tables(session):
+    """Nothing written by a rolled back transaction is visible, so forget it"""
+    session.info.pop('touched_tables', None)
@@ -0,0 +1,154 @@
+"""
+Accept-Encoding negotiation for public JSON responses
+
+Compressed bodies are cached by a digest of the uncompressed body (precomputed
+once per entry by the response cache), so each content version is compressed
+once per encoding and every later request for the same content reuses the
+stored bytes instead of recompressing.
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import request
+
+# Brotli import (optional)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+# Besides JSON (see utils.binary_formats)
+COMPRESSIBLE_MIMETYPES = {'application/msgpack', 'application/cbor'}
+
+
+def _compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class DerivedBodyCache:
+    """
+    LRU of bodies derived from a response body (compressed, re-encoded...),
+    keyed by (content digest, variant) and bounded in bytes
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, digest, variant, build):
+        """Return the cached variant of the content `digest`, calling build() at most once per content"""
+        key = (digest, variant)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        data = build()
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = data
+                self._size += len(data)
+                while self._size > self.max_bytes and self._entries:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._size -= len(evicted)
+        return data
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+class CompressionCache(DerivedBodyCache):
+    """Compressed bodies keyed by (content digest, encoding)"""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, min_size=1024):
+        super().__init__(max_bytes)
+        self.min_size = min_size
+        self.enabled = True
+
+    def init_app(self, app):
+        """Read compression settings from the app config"""
+        self.enabled = app.config.get('COMPRESSION_ENABLED', True)
+        self.min_size = app.config.get('COMPRESSION_MIN_SIZE', self.min_size)
+        self.max_bytes = app.config.get('COMPRESSION_CACHE_MAX_BYTES', self.max_bytes)
+        app.extensions['compression_cache'] = self
+
+    @property
+    def encodings(self):
+        """Supported encodings, most preferred first"""
+        return ['br', 'gzip'] if BROTLI_AVAILABLE else ['gzip']
+
+    def compressed(self, body, encoding, digest=None):
+        """
+        Return body compressed with encoding, compressing at most once per content.
+        `digest` identifies the content when the caller already knows it.
+        """
+        if digest is None:
+            digest = hashlib.blake2b(body, digest_size=16).digest()
+        return self.get_or_build(digest, encoding, lambda: _compress(body, encoding))
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'encodings': self.encodings,
+            'min_size': self.min_size,
+            **super().stats(),
+        }
+
+
+compression_cache = CompressionCache()
+
+
+def compress_response(response):
+    """after_request hook: serve a cached compressed variant when the client accepts one"""
+    if (
+        not compression_cache.enabled
+        or request.method != 'GET'
+        or response.status_code != 200
+        or not (response.is_json or response.mimetype in COMPRESSIBLE_MIMETYPES)
+        or response.direct_passthrough
+        or response.is_streamed
+        or 'Content-Encoding' in response.headers
+    ):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < compression_cache.min_size:
+        return response
+
+    encoding = request.accept_encodings.best_match(compression_cache.encodings)
+    if not encoding:
+        return response
+
+    digest = getattr(response, 'content_digest', None)
+    response.set_data(compression_cache.compressed(body, encoding, digest))
+    response.headers['Content-Encoding'] = encoding
+
+    # A strong ETag must differ per content-coding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
@@ -0,0 +1,52 @@
+"""
+Per-table change counters
+
+Every commit that writes to a table bumps that table's row in content_versions
+inside the same transaction. Reading the counters is a single small query that
+never touches the content tables, which makes them a cheap validator for
+conditional GETs.
+"""
+from datetime import datetime
+
+from sqlalchemy import select, update
+
+from models import db, ContentVersion
+from utils.change_tracking import on_tables_committing
+
+
+@on_tables_committing
+def _bump_versions(session, tables):
+    tables = tables - {ContentVersion.__tablename__}
+    for table_name in sorted(tables):
+        result = session.execute(
+            update(ContentVersion)
+            .where(ContentVersion.table_name == table_name)
+            .values(version=ContentVersion.version + 1, updated_at=datetime.utcnow())
+        )
+        if result.rowcount == 0:
+            session.add(ContentVersion(table_name=table_name, version=1))
+
+
+def current_versions(tables, session=None):
+    """Map each table name to its current version (0 when never written)"""
+    rows = (session or db.session).execute(
+        select(ContentVersion.table_name, ContentVersion.version)
+        .where(ContentVersion.table_name.in_(tables))
+    )
+    versions = dict.fromkeys(tables, 0)
+    versions.update(rows.all())
+    return versions
+
+
+def primary_versions(tables):
+    """current_versions() read on the primary, even during a request routed to the read replica"""
+    with db.engine.connect() as connection:
+        return current_versions(tables, connection)
+
+
+def all_versions():
+    """Map every table that has ever been written to its current version, read on the primary"""
+    # Not through db.session: on a replica read it would return the replica's
+    # counters, which lag behind the commits the cache must not hide
+    with db.engine.connect() as connection:
+        return dict(connection.execute(select(ContentVersion.table_name, ContentVersion.version)).all())
@@ -0,0 +1,325 @@
+"""
+Engine profiles applied to every database engine (primary and replica)
+
+SQLite: each new connection gets the production pragmas. WAL lets readers
+run alongside the single writer, and busy_timeout makes a writer wait for the
+lock instead of failing at once with "database is locked". Connections are
+pooled (QueuePool) and shared between threads.
+
+PostgreSQL: the pool is sized from the gunicorn worker and thread counts, so
+every request thread can hold a connection without the workers together
+exceeding DB_MAX_CONNECTIONS. Instead of pinging on every checkout
+(pool_pre_ping), only connections idle for DB_PING_IDLE_SECONDS are pinged;
+a connection found dead is replaced transparently, and a disconnect seen
+mid-query invalidates the pool so the next checkout reconnects.
+
+Pooled engines use MeteredQueuePool, which records checkouts, timeouts,
+disconnects and a histogram of the time spent waiting for a connection
+(pool_stats()).
+
+Under gevent workers psycopg2 waits on the server through gevent (a green
+wait callback), since libpq would otherwise block the whole worker.
+
+Every engine is also made fork-safe. Gunicorn imports the app (and opens
+connections at startup) before forking its workers, so after a fork the child
+drops the pooled connections it inherited without closing them; the parent's
+connections stay intact and each worker opens its own.
+"""
+import os
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+from models import db
+
+# PRAGMA name -> app config key
+SQLITE_PRAGMAS = {
+    'busy_timeout': 'SQLITE_BUSY_TIMEOUT',
+    'synchronous': 'SQLITE_SYNCHRONOUS',
+    'mmap_size': 'SQLITE_MMAP_SIZE',
+    'cache_size': 'SQLITE_CACHE_SIZE',
+    'foreign_keys': 'SQLITE_FOREIGN_KEYS',
+    'temp_store': 'SQLITE_TEMP_STORE',
+}
+
+
+# Upper bounds (ms) of the pool wait time histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+
+
+class PoolMetrics:
+    """Counters for one connection pool"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.disconnects = 0
+        self.pings = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._lock = threading.Lock()
+
+    def observe_wait(self, seconds, timed_out=False):
+        ms = seconds * 1000
+        bucket = next((i for i, bound in enumerate(WAIT_BUCKETS_MS) if ms <= bound), len(WAIT_BUCKETS_MS))
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self.wait_histogram[bucket] += 1
+
+    def count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            labels = [f'<={bound}ms' for bound in WAIT_BUCKETS_MS] + [f'>{WAIT_BUCKETS_MS[-1]}ms']
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'disconnects': self.disconnects,
+                'idle_pings': self.pings,
+                'wait_ms_avg': round(self.wait_total / waits * 1000, 3) if waits else 0.0,
+                'wait_ms_max': round(self.wait_max * 1000, 3),
+                # [label, count] pairs, in bucket order
+                'wait_ms_histogram': [list(pair) for pair in zip(labels, self.wait_histogram)],
+            }
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that measures how long each checkout waits for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.observe_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.observe_wait(time.perf_counter() - started)
+        return connection
+
+
+def pool_size_for(workers, threads, max_connections=None):
+    """
+    (pool_size, max_overflow) per worker process: one connection per request
+    thread plus one for background threads, the same again as overflow, all
+    within an even share of max_connections when it is set
+    """
+    pool_size = threads + 1
+    max_overflow = threads
+    if max_connections:
+        share = max(1, max_connections // max(1, workers))
+        pool_size = min(pool_size, share)
+        max_overflow = min(max_overflow, share - pool_size)
+    return pool_size, max_overflow
+
+
+def postgres_engine_options(config):
+    """Engine options for PostgreSQL: pool sized for the gunicorn workers and threads"""
+    pool_size, max_overflow = pool_size_for(
+        config['GUNICORN_WORKERS'], config['GUNICORN_THREADS'], config['DB_MAX_CONNECTIONS']
+    )
+    return {
+        'poolclass': MeteredQueuePool,
+        'pool_size': config['DB_POOL_SIZE'] or pool_size,
+        'max_overflow': max_overflow if config['DB_MAX_OVERFLOW'] is None else config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
+
+
+def sqlite_engine_options(config):
+    """Engine options for a SQLite database: pool sized for the worker's threads"""
+    return {
+        'poolclass': MeteredQueuePool,
+        'pool_size': config['SQLITE_POOL_SIZE'],
+        'max_overflow': config['SQLITE_MAX_OVERFLOW'],
+        'pool_timeout': config['SQLITE_POOL_TIMEOUT'],
+        'connect_args': {
+            # The driver's own busy handler, in seconds, matching busy_timeout
+            'timeout': config['SQLITE_BUSY_TIMEOUT'] / 1000,
+            'check_same_thread': False,
+        },
+    }
+
+
+def apply_sqlite_profile(engine, pragmas, journal_mode='wal'):
+    """Run `pragmas` (name -> value) on every new connection of a SQLite engine"""
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            if journal_mode:
+                # Persistent in the database file, so only changed once
+                cursor.execute('PRAGMA journal_mode')
+                current = cursor.fetchone()[0]
+                if current.lower() != journal_mode:
+                    try:
+                        cursor.execute(f'PRAGMA journal_mode={journal_mode}')
+                    except Exception as e:
+                        print(f"⚠️  Warning: could not switch SQLite to {journal_mode} mode: {str(e)}")
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+
+def _count(engine, name):
+    # The pool (and its metrics) is replaced on dispose, e.g. after a fork
+    metrics = getattr(engine.pool, 'metrics', None)
+    if metrics is not None:
+        metrics.count(name)
+
+
+def count_disconnects(engine):
+    """Count disconnects seen while running statements (they invalidate the pool)"""
+    @event.listens_for(engine, 'handle_error')
+    def _count_disconnect(context):
+        if context.is_disconnect:
+            _count(engine, 'disconnects')
+
+
+def ping_idle_connections(engine, idle_seconds):
+    """
+    Ping a connection on checkout only when it sat in the pool for more than
+    `idle_seconds`; a dead one is discarded and another checked out
+    """
+    @event.listens_for(engine, 'checkin')
+    def _remember_checkin(dbapi_connection, connection_record):
+        connection_record.info['checked_in_at'] = time.monotonic()
+
+    @event.listens_for(engine, 'checkout')
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get('checked_in_at')
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        _count(engine, 'pings')
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception:
+            _count(engine, 'disconnects')
+            raise exc.DisconnectionError()
+
+
+def pool_stats():
+    """Pool state and counters of every engine, for monitoring"""
+    stats = {}
+    for bind_key, engine in db.engines.items():
+        pool = engine.pool
+        entry = {'pool': type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            entry.update({
+                'size': pool.size(),
+                'connections': pool.checkedin() + pool.checkedout(),
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                'overflow': max(0, pool.overflow()),
+                'max_overflow': pool._max_overflow,
+                'timeout': pool.timeout(),
+            })
+        if isinstance(pool, MeteredQueuePool):
+            entry.update(pool.metrics.stats())
+        stats[bind_key or 'primary'] = entry
+    return stats
+
+
+def create_async_read_engine(app):
+    """
+    Async engine on the app's primary database for the ASGI read path
+    (asgi.py): aiosqlite for SQLite, asyncpg for PostgreSQL, with the same
+    SQLite profile and JSON decoding as the sync engines
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    with app.app_context():
+        url = db.engine.url
+    drivers = {'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'}
+    if url.get_backend_name() not in drivers:
+        raise ValueError(f"No async driver configured for {url.get_backend_name()} databases")
+    config = app.config
+    options = {
+        'json_deserializer': config['SQLALCHEMY_ENGINE_OPTIONS'].get('json_deserializer'),
+        'pool_size': config['ASGI_DB_POOL_SIZE'],
+        'max_overflow': config['ASGI_DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+    }
+    if url.get_backend_name() == 'sqlite':
+        options['connect_args'] = {'timeout': config['SQLITE_BUSY_TIMEOUT'] / 1000}
+    else:
+        options['pool_recycle'] = config['DB_POOL_RECYCLE']
+        options['pool_pre_ping'] = config['DB_POOL_PRE_PING']
+    engine = create_async_engine(url.set(drivername=drivers[url.get_backend_name()]), **options)
+
+    # Connect listeners go on the sync facade and run inside the driver's greenlet
+    if url.get_backend_name() == 'sqlite' and config.get('SQLITE_PROFILE_ENABLED', True):
+        pragmas = {name: config[key] for name, key in SQLITE_PRAGMAS.items()}
+        apply_sqlite_profile(engine.sync_engine, pragmas, config['SQLITE_JOURNAL_MODE'])
+    return engine
+
+
+def gevent_patched():
+    """Whether the process runs under gevent with the socket module patched"""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('socket')
+
+
+def make_psycopg2_cooperative():
+    """
+    Wait for the PostgreSQL server through gevent instead of blocking in
+    libpq, so a query in one greenlet lets the worker serve the others
+    """
+    import psycopg2
+    from psycopg2 import extensions
+    from gevent.socket import wait_read, wait_write
+
+    def _wait(connection, timeout=None):
+        while True:
+            state = connection.poll()
+            if state == extensions.POLL_OK:
+                return
+            if state == extensions.POLL_READ:
+                wait_read(connection.fileno(), timeout=timeout)
+            elif state == extensions.POLL_WRITE:
+                wait_write(connection.fileno(), timeout=timeout)
+            else:
+                raise psycopg2.OperationalError(f'Bad result from poll: {state!r}')
+
+    extensions.set_wait_callback(_wait)
+
+
+def dispose_after_fork(engine):
+    """Give a forked child its own connections instead of the parent's"""
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=lambda: engine.dispose(close=False))
+
+
+def init_app(app):
+    """Apply the engine profiles to the app's engines (call after db.init_app)"""
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite' and app.config.get('SQLITE_PROFILE_ENABLED', True):
+                pragmas = {name: app.config[key] for name, key in SQLITE_PRAGMAS.items()}
+                apply_sqlite_profile(engine, pragmas, app.config['SQLITE_JOURNAL_MODE'])
+            elif engine.dialect.name == 'postgresql' and not app.config.get('DB_POOL_PRE_PING'):
+                ping_idle_connections(engine, app.config['DB_PING_IDLE_SECONDS'])
+            if engine.dialect.driver == 'psycopg2' and gevent_patched():
+                make_psycopg2_cooperative()
+            count_disconnects(engine)
+            dispose_after_fork(engine)
@@ -0,0 +1,217 @@
+"""
+Server-Sent Events stream of portfolio changes
+
+One background thread per worker process polls the change log (see
+utils.change_log) and keeps the most recent changes in memory; every open
+stream waits on a shared condition and is handed new changes from that buffer,
+so the database cost is one small query per poll interval however many clients
+are subscribed. Commits made by the same worker wake the poller immediately;
+commits made by other workers are seen within STREAM_POLL_INTERVAL.
+
+Each event's id is the change version, so a reconnecting EventSource (which
+sends Last-Event-ID) resumes exactly where it left off.
+
+An open stream holds whatever serves it, so only processes with STREAM_ENABLED
+serve it: the gevent sidecar (gunicorn_stream.conf.py) and the gevent profile
+of the main server. check_stream_delivery() subscribes through the app and
+reports whether a committed change reaches the subscriber.
+"""
+import json
+import threading
+import time
+from collections import deque
+
+from models import db, ChangeLogEntry, Project
+from utils.change_log import LOGGED_MODELS
+from utils.change_tracking import on_tables_committed
+
+# Changes kept in memory for subscribers that fall behind; older ones are read
+# from the change log
+BUFFER_SIZE = 1000
+
+
+class ChangeBroadcaster:
+    """Fans change log entries out to every open stream of this worker"""
+
+    def __init__(self, poll_interval=1.0, heartbeat_interval=15, max_duration=25, retry_ms=3000):
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.max_duration = max_duration
+        self.retry_ms = retry_ms
+        self.enabled = True
+        self.app = None
+        self.version = None
+        self.subscribers = 0
+        self._recent = deque()
+        # Version just before the oldest buffered change
+        self._buffered_from = None
+        self._condition = threading.Condition()
+        self._wake = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread = None
+
+    def init_app(self, app):
+        """Read stream settings from the app config"""
+        self.app = app
+        self.enabled = app.config.get('STREAM_ENABLED', True)
+        self.poll_interval = app.config.get('STREAM_POLL_INTERVAL', self.poll_interval)
+        self.heartbeat_interval = app.config.get('STREAM_HEARTBEAT_INTERVAL', self.heartbeat_interval)
+        self.max_duration = app.config.get('STREAM_MAX_DURATION', self.max_duration)
+        self.retry_ms = app.config.get('STREAM_RETRY_MS', self.retry_ms)
+        app.extensions['change_broadcaster'] = self
+
+    def _start(self):
+        # Started on first use, so every forked worker gets its own poller
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                with self.app.app_context():
+                    self._poll()
+                self._thread = threading.Thread(target=self._run, name='change-broadcaster', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            try:
+                with self.app.app_context():
+                    self._poll()
+            except Exception as e:
+                print(f"⚠️  Warning: change stream poll failed: {str(e)}")
+
+    def _poll(self):
+        query = ChangeLogEntry.query.order_by(ChangeLogEntry.id.asc())
+        if self.version is None:
+            latest = db.session.query(db.func.max(ChangeLogEntry.id)).scalar() or 0
+            entries = []
+        else:
+            entries = query.filter(ChangeLogEntry.id > self.version).limit(BUFFER_SIZE).all()
+            latest = entries[-1].id if entries else self.version
+        changes = [_event_data(entry) for entry in entries]
+        db.session.remove()
+        with self._condition:
+            if self._buffered_from is None:
+                self._buffered_from = latest
+            self._recent.extend(changes)
+            while len(self._recent) > BUFFER_SIZE:
+                self._buffered_from = self._recent.popleft()['version']
+            if latest != self.version:
+                self.version = latest
+                self._condition.notify_all()
+
+    def poke(self):
+        """Poll now instead of at the next interval"""
+        self._wake.set()
+
+    def changes_after(self, version):
+        """Changes after `version`, from memory when still buffered, else from the change log"""
+        with self._condition:
+            if self.version is not None and version >= self.version:
+                return []
+            if self._buffered_from is not None and version >= self._buffered_from:
+                return [change for change in self._recent if change['version'] > version]
+        with self.app.app_context():
+            entries = ChangeLogEntry.query.filter(
+                ChangeLogEntry.id > version
+            ).order_by(ChangeLogEntry.id.asc()).limit(BUFFER_SIZE).all()
+            changes = [_event_data(entry) for entry in entries]
+            db.session.remove()
+        return changes
+
+    def wait(self, version, timeout):
+        """Block until there is a change after `version` or timeout; returns the latest version"""
+        with self._condition:
+            self._condition.wait_for(lambda: self.version > version, timeout)
+            return self.version
+
+    def stream(self, last_event_id=None):
+        """Generator of SSE messages for one subscriber"""
+        self._start()
+        version = self.version if last_event_id is None else last_event_id
+        started = time.monotonic()
+        with self._condition:
+            self.subscribers += 1
+        try:
+            yield f"retry: {self.retry_ms}\n\n"
+            while True:
+                for change in self.changes_after(version):
+                    yield f"id: {change['version']}\nevent: change\ndata: {json.dumps(change)}\n\n"
+                    version = change['version']
+
+                remaining = self.heartbeat_interval
+                if self.max_duration:
+                    remaining = min(remaining, self.max_duration - (time.monotonic() - started))
+                    if remaining <= 0:
+                        # The client reconnects (with Last-Event-ID) after `retry`
+                        return
+                if self.wait(version, remaining) <= version:
+                    yield ": heartbeat\n\n"
+        finally:
+            with self._condition:
+                self.subscribers -= 1
+
+    def stats(self):
+        with self._condition:
+            return {
+                'enabled': self.enabled,
+                'subscribers': self.subscribers,
+                'version': self.version,
+                'buffered': len(self._recent),
+                'poll_interval': self.poll_interval,
+                'max_duration': self.max_duration,
+            }
+
+
+def check_stream_delivery(app, timeout=10):
+    """
+    Open /api/stream, commit a change (a draft project, created then deleted)
+    and wait up to `timeout` seconds for its event. Returns (delivered, seconds,
+    the change events received).
+    """
+    enabled = change_broadcaster.enabled
+    change_broadcaster.enabled = True
+    response = app.test_client().get('/api/stream', buffered=False)
+    chunks = iter(response.response)
+    events = []
+    try:
+        next(chunks)  # retry: ...
+        with app.app_context():
+            project = Project(title='Stream check', description='Stream check', status='draft')
+            db.session.add(project)
+            db.session.commit()
+            project_id = project.id
+            committed = time.monotonic()
+            db.session.delete(project)
+            db.session.commit()
+            db.session.remove()
+
+        # The stream blocks for at most a heartbeat interval, so the deadline is checked between chunks
+        for chunk in chunks:
+            if time.monotonic() - committed > timeout:
+                break
+            chunk = chunk.decode('utf-8') if isinstance(chunk, bytes) else chunk
+            if not chunk.startswith('id: '):
+                continue
+            change = json.loads(chunk.split('data: ', 1)[1])
+            events.append(change)
+            if change['type'] == Project.__tablename__ and change['id'] == project_id:
+                return True, time.monotonic() - committed, events
+        return False, time.monotonic() - committed, events
+    finally:
+        response.close()
+        change_broadcaster.enabled = enabled
+
+
+def _event_data(entry):
+    return {'version': entry.id, 'type': entry.entity_type, 'id': entry.entity_id, 'op': entry.op}
+
+
+change_broadcaster = ChangeBroadcaster()
+
+LOGGED_TABLES = set(LOGGED_MODELS)
+
+
+@on_tables_committed
+def _poke_broadcaster(tables):
+    if tables & LOGGED_TABLES:
+        change_broadcaster.poke()
@@ -0,0 +1,110 @@
+"""
+Fast JSON encoding for every response
+
+Flask's default provider encodes through the stdlib json module, with a Python
+`default` callback for anything it does not know. FastJSONProvider encodes with
+orjson when it is installed: datetimes, dates, UUIDs, dataclasses and the
+lists/dicts of JSON columns are serialized natively in C, so models hand raw
+values to jsonify instead of calling isoformat() themselves. Decimals and
+objects with __html__ go through the `default` callback.
+
+Without orjson (or for values orjson rejects, such as integers beyond 64 bits)
+the stdlib encoder is used with the same conventions: ISO 8601 datetimes,
+Decimals as strings, sorted keys and non-ASCII characters written as UTF-8
+rather than \\u escapes. Both paths produce the same bytes, so ETags and
+cached bodies do not depend on whether orjson is installed.
+"""
+import dataclasses
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+from flask.json.provider import DefaultJSONProvider
+
+# orjson import (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Parser for JSON columns (see SQLALCHEMY_ENGINE_OPTIONS in app.py)
+json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def _default(o):
+    """Values neither encoder handles natively"""
+    if isinstance(o, Decimal):
+        return str(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+def _stdlib_default(o):
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, UUID):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    return _default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider encoding with orjson, falling back to the stdlib json module"""
+
+    default = staticmethod(_stdlib_default)
+    # Like orjson, which has no option to escape non-ASCII characters
+    ensure_ascii = False
+
+    def _orjson_options(self, kwargs):
+        """orjson options equivalent to json.dumps kwargs, or None if they have no equivalent"""
+        options = orjson.OPT_NON_STR_KEYS
+        for name, value in kwargs.items():
+            if name == 'indent' and value:
+                options |= orjson.OPT_INDENT_2
+            elif name == 'sort_keys' and value:
+                options |= orjson.OPT_SORT_KEYS
+            elif name == 'ensure_ascii' and value:
+                return None
+            elif name not in ('indent', 'sort_keys', 'separators', 'ensure_ascii'):
+                return None
+        if 'sort_keys' not in kwargs and self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps_bytes(self, obj, **kwargs):
+        """Serialize `obj` to UTF-8 JSON bytes (kwargs as for json.dumps)"""
+        if ORJSON_AVAILABLE:
+            options = self._orjson_options(kwargs)
+            if options is not None:
+                try:
+                    return orjson.dumps(obj, default=_default, option=options)
+                except orjson.JSONEncodeError:
+                    pass
+        return super().dumps(obj, **kwargs).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if ORJSON_AVAILABLE:
+            return self.dumps_bytes(obj, **kwargs).decode('utf-8')
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+        # catching ValueError keep working
+        if ORJSON_AVAILABLE and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def encode(self, obj):
+        """Response body for `obj`: compact JSON bytes plus a trailing newline, as jsonify writes"""
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return self.dumps_bytes(obj, indent=2) + b'\n'
+        return self.dumps_bytes(obj, separators=(',', ':')) + b'\n'
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.encode(obj), mimetype=self.mimetype)
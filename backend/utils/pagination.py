@@ -0,0 +1,101 @@
+"""
+Keyset (cursor) pagination
+
+Pages are addressed by the sort key of their first/last row instead of an
+offset, so every page costs one index range scan regardless of its depth and
+concurrent inserts never shift rows between pages. Cursors are opaque,
+URL-safe tokens.
+"""
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import DateTime, Select, tuple_
+
+from models.serialization import fetch_rows
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(values, direction):
+    """Opaque token for the row with sort key `values`, paging in `direction` ('next'/'prev')"""
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps([direction] + values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, columns):
+    """Return (direction, values) for a cursor, raising ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        direction, *values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if direction not in ('next', 'prev') or len(values) != len(columns):
+        raise ValueError('Invalid cursor')
+    try:
+        values = [
+            datetime.fromisoformat(value) if isinstance(column.type, DateTime) else value
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    return direction, values
+
+
+def page_size(requested, default=DEFAULT_PAGE_SIZE):
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE"""
+    if not requested:
+        return default
+    return max(1, min(requested, MAX_PAGE_SIZE))
+
+
+def paginate_keyset(query, columns, limit, cursor=None, session=None):
+    """
+    Fetch one page of `query` ordered by `columns` descending (newest first).
+    `query` is an ORM query or a Core select (which pages plain rows); `columns`
+    must form a unique key, e.g. (created_at, id), and be selected. A Core
+    select runs on `session` (db.session by default).
+
+    Returns (items, next_cursor, prev_cursor); a cursor is None when there is no
+    page in that direction. Raises ValueError for a malformed cursor.
+    """
+    direction = 'next'
+    if cursor:
+        key = tuple_(*columns)
+        direction, values = decode_cursor(cursor, columns)
+        if direction == 'next':
+            query = query.filter(key < tuple_(*values))
+        else:
+            query = query.filter(key > tuple_(*values))
+
+    if direction == 'next':
+        query = query.order_by(*[column.desc() for column in columns])
+    else:
+        query = query.order_by(*[column.asc() for column in columns])
+
+    # One extra row tells whether another page exists in this direction
+    if isinstance(query, Select):
+        items = fetch_rows(query.limit(limit + 1), session)
+    else:
+        items = query.limit(limit + 1).all()
+    has_more = len(items) > limit
+    items = items[:limit]
+    if direction == 'next':
+        has_next, has_prev = has_more, bool(cursor)
+    else:
+        # Paging backwards always leaves the page we came from ahead of us
+        items.reverse()
+        has_next, has_prev = True, has_more
+
+    def key_of(item):
+        return [getattr(item, column.key) for column in columns]
+
+    next_cursor = prev_cursor = None
+    if items:
+        if has_next:
+            next_cursor = encode_cursor(key_of(items[-1]), 'next')
+        if has_prev:
+            prev_cursor = encode_cursor(key_of(items[0]), 'prev')
+    return items, next_cursor, prev_cursor
@@ -0,0 +1,231 @@
+"""
+Materialized public portfolio payloads
+
+Each public section, and the aggregate /api/portfolio payload, is rendered to
+JSON bytes and stored in the portfolio_snapshots table. Snapshots are rebuilt
+inside the same transaction as any commit that writes to the tables they are
+built from, so every worker serves a single primary-key read of pre-encoded
+bytes and never sees a half-applied edit.
+"""
+from flask import Response, current_app
+from sqlalchemy.exc import IntegrityError
+
+from sqlalchemy import func, select
+
+from models import (
+    db, Project, ProjectTechnology, PersonalInfo, ImpactMetric, TechnicalSkill,
+    Experience, Education, Certification, SocialLink, PortfolioSnapshot
+)
+from models.serialization import fetch_rows
+from utils.change_tracking import on_tables_committing
+
+PORTFOLIO_KEY = 'portfolio'
+
+# Skill categories always present in the portfolio payload (even when empty),
+# followed by any other category found in the data
+DEFAULT_SKILL_CATEGORIES = ['core', 'frontend', 'backend', 'database', 'devops']
+
+
+def group_skills_by_category(skills, categories=()):
+    """Group skill names by category, keeping the query's ordering"""
+    grouped = {category: [] for category in categories}
+    for skill in skills:
+        grouped.setdefault(skill.category, []).append(skill.name)
+    return grouped
+
+
+def _rows(model, *order_by):
+    """Serialized rows of `model` selected with Core (no ORM objects)"""
+    rows = fetch_rows(model.select_rows().order_by(*order_by))
+    return model.serialize_rows(rows)
+
+
+def _personal_info():
+    rows = fetch_rows(PersonalInfo.select_rows().limit(1))
+    return PersonalInfo.serialize_rows(rows)[0] if rows else None
+
+
+def _impact_metrics():
+    return _rows(ImpactMetric, ImpactMetric.order.asc())
+
+
+def _technical_skills():
+    skills = fetch_rows(
+        select(TechnicalSkill.category, TechnicalSkill.name).order_by(
+            TechnicalSkill.category.asc(), TechnicalSkill.order.asc()
+        )
+    )
+    return group_skills_by_category(skills)
+
+
+def _experiences():
+    return _rows(Experience, Experience.order.asc())
+
+
+def _educations():
+    return _rows(Education, Education.order.asc())
+
+
+def _certifications():
+    return _rows(Certification, Certification.order.asc())
+
+
+def _social_links():
+    return _rows(SocialLink, SocialLink.order.asc())
+
+
+def _featured_projects():
+    rows = fetch_rows(
+        Project.select_rows().filter_by(status='published', featured=True).order_by(
+            Project.created_at.desc()
+        ).limit(6)
+    )
+    return {
+        'count': len(rows),
+        'projects': Project.serialize_rows(rows)
+    }
+
+
+def _project_facets():
+    """Counts of published projects per category, technology and featured flag"""
+    published = Project.status == 'published'
+    categories = db.session.query(Project.category, func.count(Project.id)).filter(
+        published
+    ).group_by(Project.category).order_by(func.count(Project.id).desc(), Project.category.asc()).all()
+    technologies = db.session.query(
+        ProjectTechnology.slug, func.min(ProjectTechnology.name), func.count(ProjectTechnology.project_id)
+    ).join(Project, Project.id == ProjectTechnology.project_id).filter(
+        published
+    ).group_by(ProjectTechnology.slug).order_by(
+        func.count(ProjectTechnology.project_id).desc(), ProjectTechnology.slug.asc()
+    ).all()
+    featured = dict(db.session.query(Project.featured, func.count(Project.id)).filter(
+        published
+    ).group_by(Project.featured).all())
+    return {
+        'total': sum(count for _, count in categories),
+        'categories': [{'value': value, 'count': count} for value, count in categories],
+        'technologies': [{'slug': slug, 'name': name, 'count': count} for slug, name, count in technologies],
+        'featured': {'true': featured.get(True, 0), 'false': sum(c for f, c in featured.items() if not f)},
+    }
+
+
+# snapshot key -> (builder, models it reads)
+SECTIONS = {
+    'personal-info': (_personal_info, (PersonalInfo,)),
+    'impact-metrics': (_impact_metrics, (ImpactMetric,)),
+    'technical-skills': (_technical_skills, (TechnicalSkill,)),
+    'experiences': (_experiences, (Experience,)),
+    'educations': (_educations, (Education,)),
+    'certifications': (_certifications, (Certification,)),
+    'social-links': (_social_links, (SocialLink,)),
+    'projects-featured': (_featured_projects, (Project,)),
+    'projects-facets': (_project_facets, (Project, ProjectTechnology)),
+}
+
+
+def _tables(models):
+    return {model.__tablename__ for model in models}
+
+
+SOURCE_TABLES = set().union(*(_tables(models) for _, models in SECTIONS.values()))
+
+# Sections included in the aggregate /api/portfolio payload
+PORTFOLIO_SECTIONS = (
+    'personal-info', 'impact-metrics', 'technical-skills', 'experiences',
+    'educations', 'certifications', 'social-links', 'projects-featured',
+)
+
+
+def build_portfolio_payload(sections):
+    """Assemble the /api/portfolio payload from rendered section payloads"""
+    return {
+        'personalInfo': sections['personal-info'],
+        'impactMetrics': sections['impact-metrics'],
+        'technicalSkills': {
+            **group_skills_by_category((), DEFAULT_SKILL_CATEGORIES),
+            **sections['technical-skills'],
+        },
+        'experiences': sections['experiences'],
+        'educations': sections['educations'],
+        'certifications': sections['certifications'],
+        'socialLinks': sections['social-links'],
+        'featuredProjects': sections['projects-featured']['projects'],
+    }
+
+
+def encode_payload(payload):
+    """Encode a payload exactly as jsonify would"""
+    return current_app.json.encode(payload)
+
+
+def _store(session, key, payload):
+    body = encode_payload(payload)
+    snapshot = session.get(PortfolioSnapshot, key)
+    if snapshot is None:
+        session.add(PortfolioSnapshot(key=key, version=1, payload=body))
+    elif snapshot.payload != body:
+        snapshot.payload = body
+        snapshot.version = snapshot.version + 1
+
+
+def rebuild_snapshots(session, tables=None):
+    """
+    Re-render the sections built from `tables` (all sections when None), and
+    the aggregate portfolio payload when one of its sections changed, writing
+    them through `session`. The aggregate reuses the stored payloads of the
+    sections that were not re-rendered, so an edit to one table runs one
+    section builder.
+    """
+    sections = {}
+    for key, (builder, models) in SECTIONS.items():
+        if tables is None or _tables(models) & tables:
+            sections[key] = builder()
+            _store(session, key, sections[key])
+    if not sections.keys() & set(PORTFOLIO_SECTIONS):
+        return
+    for key in PORTFOLIO_SECTIONS:
+        if key in sections:
+            continue
+        snapshot = session.get(PortfolioSnapshot, key)
+        if snapshot is not None:
+            sections[key] = current_app.json.loads(snapshot.payload)
+        else:
+            # Not built yet, e.g. a section added since the last full build
+            sections[key] = SECTIONS[key][0]()
+            _store(session, key, sections[key])
+    _store(session, PORTFOLIO_KEY, build_portfolio_payload(sections))
+
+
+@on_tables_committing
+def _rebuild_changed_snapshots(session, tables):
+    changed = tables & SOURCE_TABLES
+    if changed:
+        rebuild_snapshots(session, changed)
+
+
+def get_snapshot(key):
+    """
+    Load a snapshot by key, building every snapshot first if it is missing
+    (fresh database or first deploy).
+    """
+    snapshot = db.session.get(PortfolioSnapshot, key)
+    if snapshot is not None:
+        return snapshot
+
+    # Build from (and re-read after a conflict on) the primary, never a replica
+    db.session().use_primary()
+    try:
+        rebuild_snapshots(db.session)
+        db.session.commit()
+    except IntegrityError:
+        # Another worker built them at the same time
+        db.session.rollback()
+    return db.session.get(PortfolioSnapshot, key)
+
+
+def snapshot_response(snapshot):
+    """Serve a snapshot's pre-encoded bytes"""
+    response = Response(snapshot.payload, mimetype='application/json')
+    response.headers['X-Snapshot-Version'] = str(snapshot.version)
+    return response
@@ -0,0 +1,111 @@
+"""
+Queries behind the public project endpoints
+
+Shared by the Flask blueprint (routes/public_routes.py) and the ASGI read path
+(asgi.py). Each function reads through the session it is given: db.session in
+Flask, and in the ASGI app the sync facade of an AsyncSession, which
+AsyncSession.run_sync() drives on the async engine. Both entry points
+therefore run the same statements and serializers and return the same
+payloads.
+"""
+from functools import lru_cache
+
+from sqlalchemy import select
+
+from models import Project
+from models.serialization import fetch_rows
+from utils import search
+from utils.pagination import page_size, paginate_keyset
+from utils.technologies import filter_by_technologies
+
+
+@lru_cache(maxsize=None)
+def _published_rows(fields):
+    """
+    Select of the published projects' `fields` plus the pagination key. Built
+    once per projection: statements are immutable, and constructing one costs
+    about as much CPU as serializing a page of rows.
+    """
+    return Project.select_rows(fields, 'created_at', 'id').filter_by(status='published')
+
+
+def project_page(session, fields=None, featured=False, category=None, technologies=(),
+                 tech_match='all', limit=None, cursor=None):
+    """
+    One page of published projects, newest first (the /api/projects payload).
+    Raises ValueError for invalid fields, tech_match or cursor.
+    """
+    fields = Project.parse_fields(fields)
+    limit = page_size(limit)
+
+    # Plain rows of the columns being serialized (plus the pagination key),
+    # without loading ORM objects
+    query = _published_rows(fields)
+
+    if featured:
+        query = query.filter_by(featured=True)
+
+    if category:
+        query = query.filter_by(category=category)
+
+    query = filter_by_technologies(query, technologies, tech_match)
+    rows, next_cursor, prev_cursor = paginate_keyset(
+        query, (Project.created_at, Project.id), limit, cursor, session
+    )
+
+    return {
+        'count': len(rows),
+        'projects': Project.serialize_rows(rows, fields),
+        'next_cursor': next_cursor,
+        'prev_cursor': prev_cursor
+    }
+
+
+def project_search(session, q, fields=None, limit=None, cursor=None):
+    """
+    Published projects matching `q`, best match first, each with a highlighted
+    `snippet` (the /api/projects/search payload). Raises ValueError for an
+    empty query, invalid fields or cursor.
+    """
+    q = q.strip()
+    if not q:
+        raise ValueError('Search query (q) is required')
+    limit = page_size(limit)
+
+    fields = Project.parse_fields(fields)
+    ranked = search.ranked_matches(q)
+    if ranked is None:
+        matches, next_cursor, prev_cursor = [], None, None
+    else:
+        matches, next_cursor, prev_cursor = paginate_keyset(
+            select(ranked), (ranked.c.score, ranked.c.id), limit, cursor, session
+        )
+
+    ids = [match.id for match in matches]
+    rows = fetch_rows(
+        Project.select_rows(fields, 'id').where(Project.id.in_(ids)), session
+    ) if ids else []
+    projects = {
+        row.id: project for row, project in zip(rows, Project.serialize_rows(rows, fields))
+    }
+    excerpts = search.snippets(q, ids, session)
+
+    results = []
+    for project_id in ids:
+        result = projects[project_id]
+        result['snippet'] = excerpts.get(project_id)
+        results.append(result)
+
+    return {
+        'query': q,
+        'count': len(results),
+        'projects': results,
+        'next_cursor': next_cursor,
+        'prev_cursor': prev_cursor
+    }
+
+
+def published_project(session, project_id):
+    """A published project's public dict, or None"""
+    rows = fetch_rows(Project.select_rows().filter_by(id=project_id, status='published'), session)
+    return Project.serialize_rows(rows)[0] if rows else None
@@ -0,0 +1,226 @@
+"""
+Index maintenance and query-plan regression checks for the hot public queries
+
+ensure_indexes() creates any index declared on the models that an existing
+database is missing (db.create_all() only creates indexes together with new
+tables). check_query_plans() runs the query functions of the public routes,
+EXPLAINs every statement they execute and reports any that would need a full
+table scan or a separate sort/grouping step. check_query_budgets() counts the
+statements issued while building and serving /api/portfolio, so an N+1 query
+cannot come back unnoticed. check_conditional_requests() checks that a
+revalidation answered with a 304 reads the content_versions counters and
+nothing else.
+"""
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import event, select
+
+from models import db, ContentVersion, Project
+from utils import public_reads
+from utils.pagination import MAX_PAGE_SIZE, encode_cursor, paginate_keyset
+from utils.portfolio_snapshots import SECTIONS, rebuild_snapshots
+from utils.response_cache import response_cache
+
+# Statements allowed for building every snapshot, whatever the number of rows:
+# one SELECT per section (the facets take three) and one primary-key lookup per
+# stored snapshot, sections plus the aggregate
+PORTFOLIO_BUILD_BUDGET = 11 + len(SECTIONS) + 1
+# Serving /api/portfolio (response cache bypassed): the content_versions
+# counters for its ETag, then the stored snapshot
+PORTFOLIO_REQUEST_BUDGET = 2
+
+
+def ensure_indexes():
+    """Create every model-declared index missing from the database; returns their names"""
+    inspector = db.inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(db.engine)
+                created.append(index.name)
+    return created
+
+
+def hot_queries():
+    """
+    (name, function) for every query shape the public routes run per request,
+    plus the snapshot builders run on every admin commit. Each function calls
+    the code the route itself runs (utils.public_reads, the snapshot builders),
+    so the checked SQL is the SQL that is served, not a copy of it.
+    """
+    cursor = encode_cursor([datetime(2024, 1, 1), 1], 'next')
+    return [
+        ('projects', lambda: public_reads.project_page(db.session)),
+        ('projects page 2', lambda: public_reads.project_page(db.session, cursor=cursor)),
+        ('projects featured', lambda: public_reads.project_page(db.session, featured=True)),
+        ('projects by category', lambda: public_reads.project_page(db.session, category='web')),
+        ('projects by technology', lambda: public_reads.project_page(db.session, technologies=['react'])),
+        ('projects by all technologies', lambda: public_reads.project_page(
+            db.session, technologies=['react', 'flask'], tech_match='all'
+        )),
+        ('projects by any technology', lambda: public_reads.project_page(
+            db.session, technologies=['react', 'flask'], tech_match='any'
+        )),
+        ('project detail', lambda: public_reads.published_project(db.session, 1)),
+        ('admin projects', lambda: paginate_keyset(
+            Project.select_rows(Project.CARD_FIELDS, 'created_at', 'id'), (Project.created_at, Project.id), MAX_PAGE_SIZE
+        )),
+    ] + [
+        (f'{key} snapshot', builder) for key, (builder, _) in SECTIONS.items()
+        # Facets aggregate every published project (and only run when an admin edit
+        # commits); personal info is a single row read with LIMIT 1
+        if key not in ('projects-facets', 'personal-info')
+    ]
+
+
+def _statements(function):
+    """The (SQL, parameters) of every SELECT that function() executes"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    # Every engine, so reads routed to the replica are counted too
+    engines = set(db.engines.values())
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', record)
+    try:
+        function()
+    finally:
+        for engine in engines:
+            event.remove(engine, 'before_cursor_execute', record)
+        db.session.rollback()
+    return statements
+
+
+def _sqlite_plan(conn, sql, parameters):
+    lines = [row[3] for row in conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}', parameters)]
+    problems = []
+    for line in lines:
+        if line.startswith('SCAN ') and ' USING ' not in line:
+            problems.append(f'full scan: {line}')
+        if 'USE TEMP B-TREE' in line:
+            problems.append(f'separate sort: {line}')
+    return lines, problems
+
+
+def _walk_pg_plan(node):
+    yield node
+    for child in node.get('Plans', []):
+        yield from _walk_pg_plan(child)
+
+
+def _postgres_plan(conn, sql, parameters):
+    # Tiny tables make sequential scans look cheapest; disable them to check that
+    # an index path exists at all
+    conn.exec_driver_sql('SET LOCAL enable_seqscan = off')
+    plan = conn.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {sql}', parameters).scalar()[0]['Plan']
+    nodes = list(_walk_pg_plan(plan))
+    lines = [f"{node['Node Type']} {node.get('Relation Name', '')}".strip() for node in nodes]
+    problems = []
+    for node in nodes:
+        if node['Node Type'] == 'Seq Scan':
+            problems.append(f"full scan: {node.get('Relation Name')}")
+        if node['Node Type'] in ('Sort', 'Incremental Sort'):
+            problems.append(f"separate sort: {node.get('Sort Key')}")
+        if node['Node Type'] == 'Aggregate' and node.get('Strategy') == 'Hashed':
+            problems.append(f"separate grouping: {node.get('Group Key')}")
+    return lines, problems
+
+
+def check_query_plans():
+    """
+    EXPLAIN every hot query. Returns a list of (name, plan lines, problems);
+    `problems` is empty when the query is served from an index.
+    """
+    dialect = db.engine.dialect
+    explain = _postgres_plan if dialect.name == 'postgresql' else _sqlite_plan
+    results = []
+    for name, function in hot_queries():
+        statements = _statements(function)
+        with db.engine.begin() as conn:
+            for i, (sql, parameters) in enumerate(statements):
+                lines, problems = explain(conn, sql, parameters)
+                results.append((name if len(statements) == 1 else f'{name} #{i + 1}', lines, problems))
+            conn.rollback()
+    return results
+
+
+def _portfolio_request():
+    enabled = response_cache.enabled
+    response_cache.enabled = False
+    try:
+        # Served from the snapshot: build it first, outside the count
+        current_app.test_client().get('/api/portfolio')
+        return _statements(lambda: current_app.test_client().get('/api/portfolio'))
+    finally:
+        response_cache.enabled = enabled
+
+
+def check_query_budgets():
+    """
+    Count the statements of the /api/portfolio build and request. Returns a
+    list of (name, statements, budget); a count above the budget is a
+    regression (e.g. a query per row). Run it on a database with content.
+    """
+    return [
+        ('portfolio build', _statements(lambda: rebuild_snapshots(db.session)), PORTFOLIO_BUILD_BUDGET),
+        ('portfolio request', _portfolio_request(), PORTFOLIO_REQUEST_BUDGET),
+    ]
+
+
+def _conditional_paths():
+    paths = ['/api/projects', '/api/portfolio']
+    project_id = db.session.execute(
+        select(Project.id).filter_by(status='published').limit(1)
+    ).scalar()
+    if project_id is not None:
+        paths.insert(1, f'/api/projects/{project_id}')
+    db.session.rollback()
+    return paths
+
+
+def check_conditional_requests():
+    """
+    Revalidate the list, detail and portfolio endpoints with their current
+    ETag. Returns a list of (path, statements, problems); `problems` is empty
+    when the request got a 304 after reading only content_versions, without
+    loading a single mapped instance.
+    """
+    client = current_app.test_client()
+    other_tables = [name for name in db.metadata.tables if name != ContentVersion.__tablename__]
+    results = []
+    for path in _conditional_paths():
+        etag = client.get(path).headers.get('ETag')
+        loaded = []
+
+        def record_load(target, context):
+            loaded.append(type(target).__name__)
+
+        event.listen(db.Model, 'load', record_load, propagate=True)
+        try:
+            responses = []
+            statements = _statements(
+                lambda: responses.append(client.get(path, headers={'If-None-Match': etag or '""'}))
+            )
+        finally:
+            event.remove(db.Model, 'load', record_load)
+
+        problems = []
+        if responses[0].status_code != 304:
+            problems.append(f'status {responses[0].status_code}, not 304')
+        if loaded:
+            problems.append(f"loaded {len(loaded)} instances ({', '.join(sorted(set(loaded)))})")
+        for sql, _ in statements:
+            read = [name for name in other_tables if f'{name}.' in sql or f'FROM {name}' in sql]
+            if ContentVersion.__tablename__ not in sql or read:
+                problems.append(f"read {', '.join(read) or 'something other than content_versions'}")
+        results.append((path, statements, problems))
+    return results
@@ -0,0 +1,193 @@
+"""
+Read-replica routing for the public blueprint
+
+With DATABASE_REPLICA_URL set, GET/HEAD requests to the public blueprint read
+from the replica (see models.session.RoutingSession); admin requests and public
+writes (/api/subscribe, /api/contact) use the primary. The primary is used
+instead of the replica when:
+
+- the client wrote recently: any request whose commit wrote rows gets a short
+  lived cookie, and requests carrying it read from the primary for
+  REPLICA_STICKY_SECONDS (read-your-writes for the admin after an edit);
+- the replica lags: every REPLICA_CHECK_INTERVAL seconds the content_versions
+  counters of both databases are compared, and the replica is skipped while
+  it is missing a write the primary had more than REPLICA_MAX_LAG seconds ago;
+- the replica is down: a failed check or a connection error on the replica
+  engine takes it out of rotation until the next successful check. The request
+  that hit the error is dispatched again, once, reading from the primary.
+
+Because lag is measured from content_versions rather than a server-specific
+function, the same logic runs on PostgreSQL streaming replicas and on two
+SQLite files standing in for primary and replica.
+"""
+import threading
+import time
+from collections import deque
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from models import db, ContentVersion
+from models.session import REPLICA_BIND
+
+STICKY_COOKIE = 'read_primary_until'
+
+
+class ReplicaRouter:
+    """Decides per request whether the public blueprint may read from the replica"""
+
+    def __init__(self, max_lag=5.0, check_interval=5.0, sticky_seconds=10):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.sticky_seconds = sticky_seconds
+        self.app = None
+        self.healthy = False
+        self.lag = None
+        self.last_error = None
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self._checked_at = None
+        # (total version, first seen at) of recent primary states, oldest first
+        self._primary_states = deque()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Read replica settings from the app config"""
+        self.app = app
+        self.max_lag = app.config.get('REPLICA_MAX_LAG', self.max_lag)
+        self.check_interval = app.config.get('REPLICA_CHECK_INTERVAL', self.check_interval)
+        self.sticky_seconds = app.config.get('REPLICA_STICKY_SECONDS', self.sticky_seconds)
+        app.after_request(self._set_sticky_cookie)
+        app.extensions['read_replica'] = self
+        if self.enabled:
+            with app.app_context():
+                self.watch_engine(db.engines[REPLICA_BIND])
+
+    @property
+    def enabled(self):
+        return self.app is not None and REPLICA_BIND in self.app.config.get('SQLALCHEMY_BINDS', {})
+
+    def route_reads(self, blueprint):
+        """Let GET/HEAD requests to `blueprint` read from the replica, retrying on the primary if it fails"""
+        blueprint.before_request(self._route_request)
+        blueprint.register_error_handler(OperationalError, self._retry_on_primary)
+
+    def _route_request(self):
+        if not self.enabled or request.method not in ('GET', 'HEAD'):
+            return
+        if self._sticky() or not self.available():
+            self.primary_reads += 1
+            return
+        self.replica_reads += 1
+        g.read_replica = True
+
+    def _retry_on_primary(self, error):
+        # Only a read routed to the replica is retried, and only once: after
+        # this, the request reads from the primary and a new error is a 500
+        if not g.pop('read_replica', False):
+            raise error
+        db.session.remove()
+        self.replica_reads -= 1
+        self.primary_reads += 1
+        return current_app.view_functions[request.endpoint](**request.view_args)
+
+    def reads_own_writes(self):
+        """Whether this request must see the client's recent writes (it carries the sticky cookie)"""
+        return self.enabled and has_request_context() and self._sticky()
+
+    def _sticky(self):
+        try:
+            return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def _set_sticky_cookie(self, response):
+        # GETs only write when rebuilding snapshots; that is not the client's write
+        if self.enabled and g.get('db_wrote') and request.method not in ('GET', 'HEAD'):
+            response.set_cookie(
+                STICKY_COOKIE, str(int(time.time() + self.sticky_seconds)),
+                max_age=self.sticky_seconds, httponly=True, samesite='Lax'
+            )
+        return response
+
+    def available(self):
+        """Whether the replica is up and caught up, re-checking every check_interval"""
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.check_interval:
+            # One request per worker runs the check; the others use the last result
+            if self._lock.acquire(blocking=False):
+                try:
+                    self.check(now)
+                finally:
+                    self._lock.release()
+        return self.healthy
+
+    def check(self, now=None):
+        """Compare the replica with the primary and update `healthy`/`lag`"""
+        now = time.monotonic() if now is None else now
+        self._checked_at = now
+        try:
+            primary = _total_version(db.engines[None])
+            replica = _total_version(db.engines[REPLICA_BIND])
+        except Exception as e:
+            self._mark_down(e)
+            return
+        if not self._primary_states:
+            # How long the primary has been in its current state is unknown
+            self._primary_states.append((primary, None))
+        elif self._primary_states[-1][0] != primary:
+            self._primary_states.append((primary, now))
+        # States the replica has caught up with no longer matter
+        while len(self._primary_states) > 1 and self._primary_states[0][0] <= replica:
+            self._primary_states.popleft()
+        oldest, seen_at = self._primary_states[0]
+        if oldest <= replica:
+            self.lag = 0.0
+        else:
+            self.lag = None if seen_at is None else now - seen_at
+        self.healthy = self.lag is not None and self.lag <= self.max_lag
+        self.last_error = None
+
+    def _mark_down(self, error):
+        error = getattr(error, 'orig', None) or error
+        if self.healthy or self.last_error is None:
+            print(f"⚠️  Warning: read replica unavailable, reading from the primary: {str(error)}")
+        self.healthy = False
+        self.lag = None
+        self.last_error = str(error)
+
+    def watch_engine(self, engine):
+        """Take the replica out of rotation as soon as one of its connections fails"""
+        @event.listens_for(engine, 'handle_error')
+        def _replica_error(context):
+            if context.is_disconnect or isinstance(context.sqlalchemy_exception, OperationalError):
+                self._checked_at = time.monotonic()
+                self._mark_down(context.original_exception)
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'healthy': self.healthy,
+            'lag': self.lag,
+            'max_lag': self.max_lag,
+            'replica_reads': self.replica_reads,
+            'primary_reads': self.primary_reads,
+            'last_error': self.last_error,
+        }
+
+
+def _total_version(engine):
+    """Sum of all content_versions counters: grows with every committed write"""
+    with engine.connect() as connection:
+        return connection.execute(select(func.coalesce(func.sum(ContentVersion.version), 0))).scalar()
+
+
+replica_router = ReplicaRouter()
+
+
+@event.listens_for(Session, 'after_commit')
+def _remember_write(session):
+    if session.info.pop('wrote', False) and has_request_context():
+        g.db_wrote = True
@@ -0,0 +1,417 @@
+"""
+Response cache for public GET endpoints
+
+Stores the serialized JSON body of each response keyed by route + query string,
+together with the change counters (see utils.content_versions) of the tables
+the view reads at the time it was built. Entries live in a pluggable backend
+(see utils.cache_backends), so all gunicorn workers can share one cache.
+
+An entry is only served while its counters are current. Each worker re-reads
+the counters from the primary database at most every
+RESPONSE_CACHE_SYNC_INTERVAL seconds, and immediately after one of its own
+commits, so an admin edit made through any worker stops stale entries being
+served everywhere within that interval. A request that must read its own
+writes (see utils.read_replica) checks the entry against the primary's
+counters before it is served, and is never given a stale body.
+
+Views marked stale_while_revalidate rebuild single-flight: after a change, one
+request (in any worker sharing the backend) takes a short lock in the backend and
+rebuilds the entry, while concurrent requests keep getting the previous body for
+up to RESPONSE_CACHE_MAX_STALE seconds. Past that bound, or when there is no
+previous body at all, they wait for the rebuild instead of running the view too.
+
+Responses also carry a strong ETag derived from the same counters, so a
+revalidating client gets a 304 after one read of the counters, without any
+content rows being loaded.
+"""
+import hashlib
+import json
+import struct
+import threading
+import time
+import uuid
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import Response, make_response, request
+
+from utils.cache_backends import create_backend, MemoryBackend
+from utils.change_tracking import on_tables_committed
+from utils.content_versions import all_versions, current_versions, primary_versions
+from utils.read_replica import replica_router
+
+# Suffixes utils.compression appends to the ETag of a compressed representation
+ENCODING_SUFFIXES = ('gzip', 'br')
+# Suffixes utils.binary_formats appends to the ETag of a binary representation
+FORMAT_SUFFIXES = ('msgpack', 'cbor')
+
+_HEADER_LENGTH = struct.Struct('>I')
+
+
+class CacheEntry:
+    """A cached response body plus the table versions it was built from"""
+
+    __slots__ = ('body', 'status', 'mimetype', 'versions', 'etag', 'created_at', 'digest')
+
+    def __init__(self, body, status, mimetype, versions, etag=None, created_at=None, digest=None):
+        self.body = body
+        self.etag = etag
+        # Identifies this content version, e.g. for the compression cache
+        self.digest = digest or hashlib.blake2b(body, digest_size=16).digest()
+        self.status = status
+        self.mimetype = mimetype
+        self.versions = dict(versions)
+        self.created_at = created_at or time.time()
+
+    @property
+    def tags(self):
+        return frozenset(self.versions)
+
+    def to_bytes(self):
+        header = json.dumps({
+            'status': self.status,
+            'mimetype': self.mimetype,
+            'versions': self.versions,
+            'etag': self.etag,
+            'created_at': self.created_at,
+            'digest': self.digest.hex(),
+        }, separators=(',', ':')).encode('utf-8')
+        return _HEADER_LENGTH.pack(len(header)) + header + self.body
+
+    @classmethod
+    def from_bytes(cls, data):
+        (length,) = _HEADER_LENGTH.unpack_from(data)
+        start = _HEADER_LENGTH.size
+        header = json.loads(data[start:start + length])
+        return cls(
+            bytes(data[start + length:]), header['status'], header['mimetype'], header['versions'],
+            header['etag'], header['created_at'], bytes.fromhex(header['digest'])
+        )
+
+    def outdated_tables(self, versions):
+        """Tables that have changed since the entry was built"""
+        return [table for table, version in self.versions.items() if version < versions.get(table, 0)]
+
+
+class ResponseCache:
+    """Serialized responses in a pluggable backend, invalidated by table versions"""
+
+    def __init__(self, max_entries=256, ttl=None, sync_interval=1.0, max_stale=30, lock_timeout=10):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+        self.max_stale = max_stale
+        self.lock_timeout = lock_timeout
+        self.enabled = True
+        self.backend = MemoryBackend(max_entries)
+        self._lock = threading.Lock()
+        self._versions = {}
+        # When this worker first saw each table's latest version
+        self._changed_at = {}
+        self._synced_at = None
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.waits = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def init_app(self, app):
+        """Read cache settings from the app config and create the backend"""
+        self.enabled = app.config.get('RESPONSE_CACHE_ENABLED', True)
+        self.max_entries = app.config.get('RESPONSE_CACHE_MAX_ENTRIES', self.max_entries)
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', self.ttl)
+        self.sync_interval = app.config.get('RESPONSE_CACHE_SYNC_INTERVAL', self.sync_interval)
+        self.max_stale = app.config.get('RESPONSE_CACHE_MAX_STALE', self.max_stale)
+        self.lock_timeout = app.config.get('RESPONSE_CACHE_LOCK_TIMEOUT', self.lock_timeout)
+        backend = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+        try:
+            self.backend = create_backend(
+                backend,
+                max_entries=self.max_entries,
+                path=app.config.get('RESPONSE_CACHE_PATH'),
+                redis_url=app.config.get('RESPONSE_CACHE_REDIS_URL'),
+            )
+        except Exception as e:
+            print(f"⚠️  Could not create '{backend}' response cache backend: {e}")
+            print("💡 Falling back to the in-process cache")
+            self.backend = MemoryBackend(self.max_entries)
+        app.extensions['response_cache'] = self
+
+    def known_versions(self):
+        """This worker's view of the table versions, re-read when older than sync_interval"""
+        now = time.monotonic()
+        with self._lock:
+            if self._synced_at is not None and now - self._synced_at < self.sync_interval:
+                return self._versions
+        versions = all_versions()
+        with self._lock:
+            self._merge(versions)
+            self._synced_at = now
+            return self._versions
+
+    def _merge(self, versions):
+        # Counters only grow; never let an older read overwrite a newer one
+        merged = dict(self._versions)
+        now = time.monotonic()
+        for table, version in versions.items():
+            if version > merged.get(table, 0):
+                merged[table] = version
+                self._changed_at[table] = now
+        self._versions = merged
+
+    def observe(self, versions):
+        """Record versions read elsewhere (they are at least as fresh as ours)"""
+        with self._lock:
+            self._merge(versions)
+
+    def _load(self, key):
+        try:
+            data = self.backend.get(key)
+            return CacheEntry.from_bytes(data) if data is not None else None
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            return None
+
+    def lookup(self, key):
+        """
+        Return (entry, stale_for): the stored entry for key (or None) and, when it
+        is outdated, the seconds since this worker saw the change that outdated it
+        (None while the entry is current).
+        """
+        entry = self._load(key)
+        stale_for = None
+        if entry is not None:
+            outdated = entry.outdated_tables(self.known_versions())
+            if outdated:
+                with self._lock:
+                    changed_at = min(self._changed_at.get(table, 0) for table in outdated)
+                    stale_for = time.monotonic() - changed_at
+        with self._lock:
+            if entry is None or stale_for is not None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry, stale_for
+
+    def get(self, key):
+        """Return the current entry for key, or None"""
+        entry, stale_for = self.lookup(key)
+        if stale_for is not None:
+            with self._lock:
+                self.invalidations += 1
+            return None
+        return entry
+
+    def acquire(self, key):
+        """Take the rebuild lock for key; returns a token, or None if another request holds it"""
+        token = uuid.uuid4().hex.encode('ascii')
+        try:
+            if self.backend.add(f'lock:{key}', token, self.lock_timeout):
+                return token
+            return None
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            # Without a working backend every request rebuilds on its own
+            return token
+
+    def release(self, key, token):
+        """Release a lock taken by acquire() (unless it expired and was taken over)"""
+        try:
+            if self.backend.get(f'lock:{key}') == token:
+                self.backend.delete(f'lock:{key}')
+        except Exception:
+            with self._lock:
+                self.errors += 1
+
+    def wait(self, key, poll_interval=0.05):
+        """
+        Wait for the request holding the rebuild lock for key; returns the
+        current entry once stored, or None if the lock was released or expired
+        without one.
+        """
+        with self._lock:
+            self.waits += 1
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(poll_interval)
+            entry = self._load(key)
+            if entry is not None and not entry.outdated_tables(self.known_versions()):
+                return entry
+            try:
+                if self.backend.get(f'lock:{key}') is None:
+                    return None
+            except Exception:
+                return None
+        return None
+
+    def served_stale(self):
+        with self._lock:
+            self.stale_hits += 1
+
+    def set(self, key, entry):
+        """Store entry (replacing any older one for key)"""
+        try:
+            self.backend.set(key, entry.to_bytes(), self.ttl)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+
+    def invalidate_tags(self, tags):
+        """Tables were written by this worker: re-read the versions on the next lookup"""
+        with self._lock:
+            self._synced_at = None
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        """Counters for monitoring cache effectiveness (hits/misses are per worker)"""
+        try:
+            backend = self.backend.stats()
+        except Exception as e:
+            backend = {'backend': self.backend.name, 'error': str(e)}
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'ttl': self.ttl,
+                'sync_interval': self.sync_interval,
+                'max_stale': self.max_stale,
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale_hits': self.stale_hits,
+                'waits': self.waits,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'invalidations': self.invalidations,
+                'errors': self.errors,
+                **backend,
+            }
+
+
+response_cache = ResponseCache()
+
+
+@on_tables_committed
+def _invalidate_committed_tables(tables):
+    response_cache.invalidate_tags(tables)
+
+
+def cache_key(path, args):
+    """Route path plus a canonical (sorted) query string of the (name, value) pairs `args`"""
+    args = sorted(args)
+    return f"{path}?{urlencode(args)}" if args else path
+
+
+def _cache_key():
+    return cache_key(request.path, request.args.items(multi=True))
+
+
+def content_etag(key, versions):
+    """Strong validator for key, derived from the change counters of its tables"""
+    versions = sorted(versions.items())
+    return hashlib.blake2b(f"{key}|{versions}".encode('utf-8'), digest_size=16).hexdigest()
+
+
+def matching_etag(etag, if_none_match):
+    """
+    The form of etag named by `if_none_match` (parsed If-None-Match) - as
+    served, or with the format suffix added by utils.binary_formats and/or the
+    content-coding suffix added by utils.compression - or None.
+    """
+    formats = [etag] + [f"{etag}-{suffix}" for suffix in FORMAT_SUFFIXES]
+    for candidate in formats + [f"{form}-{encoding}" for form in formats for encoding in ENCODING_SUFFIXES]:
+        if if_none_match.contains_weak(candidate):
+            return candidate
+    return None
+
+
+def _entry_response(entry, cache_status):
+    response = Response(entry.body, status=entry.status, mimetype=entry.mimetype)
+    response.content_digest = entry.digest
+    response.set_etag(entry.etag)
+    response.headers['X-Cache'] = cache_status
+    return response
+
+
+def _build_response(view, args, kwargs, key, tags):
+    """Run the view and store its response"""
+    # Read before the view runs, so an entry is never labelled newer than its content
+    versions = current_versions(tags)
+    response_cache.observe(versions)
+    etag = content_etag(key, versions)
+    response = make_response(view(*args, **kwargs))
+    if response.status_code == 200 and response.is_json and not response.is_streamed:
+        response.set_etag(etag)
+        if response_cache.enabled:
+            entry = CacheEntry(response.get_data(), response.status_code, response.mimetype, versions, etag)
+            response_cache.set(key, entry)
+            response.content_digest = entry.digest
+            response.headers['X-Cache'] = 'MISS'
+    return response
+
+
+def cached_response(*models, stale_while_revalidate=False):
+    """
+    Cache a GET view's JSON response, tagged with the tables of `models`, and
+    answer conditional requests with a 304 without running the view.
+    Only 200 responses are stored.
+
+    With stale_while_revalidate, only one request at a time rebuilds the entry;
+    the others serve the previous body (X-Cache: STALE) while it is within
+    max_stale, and otherwise wait for the rebuild.
+    """
+    tags = frozenset(model.__tablename__ for model in models)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+
+            key = _cache_key()
+            if request.if_none_match:
+                versions = current_versions(tags)
+                response_cache.observe(versions)
+                matched = matching_etag(content_etag(key, versions), request.if_none_match)
+                if matched:
+                    response = Response(status=304)
+                    response.set_etag(matched)
+                    return response
+
+            if not response_cache.enabled:
+                return _build_response(view, args, kwargs, key, tags)
+
+            own_writes = replica_router.reads_own_writes()
+            if own_writes:
+                # Do not wait for the next sync: the client's write may have gone through another worker
+                response_cache.observe(primary_versions(tags))
+
+            if not stale_while_revalidate:
+                entry = response_cache.get(key)
+                if entry is not None:
+                    return _entry_response(entry, 'HIT')
+                return _build_response(view, args, kwargs, key, tags)
+
+            entry, stale_for = response_cache.lookup(key)
+            if entry is not None and stale_for is None:
+                return _entry_response(entry, 'HIT')
+
+            token = response_cache.acquire(key)
+            if token is None:
+                if entry is not None and stale_for < response_cache.max_stale and not own_writes:
+                    response_cache.served_stale()
+                    return _entry_response(entry, 'STALE')
+                entry = response_cache.wait(key)
+                if entry is not None:
+                    return _entry_response(entry, 'HIT')
+                # The rebuilding request failed or timed out: rebuild here
+            try:
+                return _build_response(view, args, kwargs, key, tags)
+            finally:
+                if token is not None:
+                    response_cache.release(key, token)
+        return wrapper
+    return decorator
@@ -0,0 +1,145 @@
+"""
+On-demand revalidation webhooks for the Next.js frontends
+
+After every commit that changes portfolio entities, the pages showing them
+are queued for revalidation. A background thread
+waits until edits have been quiet for REVALIDATE_DEBOUNCE seconds (or
+REVALIDATE_MAX_WAIT has passed since the first queued edit), then POSTs the
+accumulated paths to every configured webhook in one request:
+
+    POST <url>  X-Revalidate-Secret: <secret>
+    {"paths": ["/"]}
+
+Admin requests only add paths to the queue, so they are never slowed by the
+webhooks.
+"""
+import json
+import threading
+import time
+import urllib.request
+
+from utils.change_log import on_changes_committed
+
+# Pages to revalidate per changed entity type ("*" for any other); "{id}" is
+# the entity's id. The frontend is a single page rendering every portfolio
+# section, so "/" is the only page; a frontend with more routes maps them with
+# REVALIDATE_PATHS, e.g. {"projects": ["/", "/projects/{id}"]}.
+DEFAULT_PATHS = {
+    '*': ['/'],
+}
+
+
+class RevalidationSender:
+    """Debounced, background delivery of revalidation webhooks"""
+
+    def __init__(self, urls=(), secret=None, debounce=2.0, max_wait=10.0, timeout=5, retries=3):
+        self.urls = list(urls)
+        self.secret = secret
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self.retries = retries
+        self.paths = dict(DEFAULT_PATHS)
+        self._pending = set()
+        self._first_queued_at = None
+        self._last_queued_at = None
+        self._condition = threading.Condition()
+        self._thread = None
+        self.sent = 0
+        self.failed = 0
+        self.last_error = None
+
+    def init_app(self, app):
+        """Read webhook settings from the app config"""
+        self.urls = app.config.get('REVALIDATE_WEBHOOK_URLS', self.urls)
+        self.secret = app.config.get('REVALIDATE_SECRET', self.secret)
+        self.debounce = app.config.get('REVALIDATE_DEBOUNCE', self.debounce)
+        self.max_wait = app.config.get('REVALIDATE_MAX_WAIT', self.max_wait)
+        self.paths = {**DEFAULT_PATHS, **app.config.get('REVALIDATE_PATHS', {})}
+        app.extensions['revalidation'] = self
+
+    def paths_for(self, changes):
+        """Pages affected by a list of (entity_type, entity_id, op)"""
+        paths = set()
+        for entity_type, entity_id, _ in changes:
+            for template in self.paths.get(entity_type, self.paths['*']):
+                paths.add(template.format(id=entity_id))
+        return paths
+
+    def enqueue(self, paths):
+        """Queue paths for the next webhook call"""
+        if not self.urls or not paths:
+            return
+        now = time.monotonic()
+        with self._condition:
+            self._pending.update(paths)
+            if self._first_queued_at is None:
+                self._first_queued_at = now
+            self._last_queued_at = now
+            # Started on first use, so every forked worker gets its own sender
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='revalidation-sender', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _next_batch(self):
+        """Block until a batch is due, then take it"""
+        with self._condition:
+            while True:
+                if not self._pending:
+                    self._condition.wait()
+                    continue
+                due = min(self._last_queued_at + self.debounce, self._first_queued_at + self.max_wait)
+                remaining = due - time.monotonic()
+                if remaining <= 0:
+                    paths = sorted(self._pending)
+                    self._pending.clear()
+                    self._first_queued_at = self._last_queued_at = None
+                    return paths
+                self._condition.wait(remaining)
+
+    def _run(self):
+        while True:
+            paths = self._next_batch()
+            for url in self.urls:
+                self.deliver(url, paths)
+
+    def deliver(self, url, paths):
+        """POST paths to one webhook, retrying with backoff; returns True on success"""
+        body = json.dumps({'paths': paths}).encode('utf-8')
+        headers = {'Content-Type': 'application/json'}
+        if self.secret:
+            headers['X-Revalidate-Secret'] = self.secret
+        for attempt in range(self.retries):
+            try:
+                request = urllib.request.Request(url, data=body, headers=headers, method='POST')
+                with urllib.request.urlopen(request, timeout=self.timeout):
+                    pass
+                self.sent += 1
+                return True
+            except Exception as e:
+                self.last_error = f'{url}: {e}'
+                if attempt + 1 < self.retries:
+                    time.sleep(2 ** attempt)
+        self.failed += 1
+        print(f"⚠️  Warning: revalidation webhook failed: {self.last_error}")
+        return False
+
+    def stats(self):
+        with self._condition:
+            return {
+                'webhooks': len(self.urls),
+                'pending': len(self._pending),
+                'debounce': self.debounce,
+                'sent': self.sent,
+                'failed': self.failed,
+                'last_error': self.last_error,
+            }
+
+
+revalidation_sender = RevalidationSender()
+
+
+@on_changes_committed
+def _queue_revalidation(changes):
+    revalidation_sender.enqueue(revalidation_sender.paths_for(changes))
@@ -0,0 +1,213 @@
+"""
+Full-text search over projects
+
+Backed by an FTS5 virtual table on SQLite and a tsvector column with a GIN index
+on PostgreSQL (any other database falls back to a LIKE scan). The index is kept
+in sync by Project mapper events, so it is written in the same transaction as
+every create, update and delete.
+"""
+import re
+
+from sqlalchemy import Float, Integer, event, text
+
+from models import db, Project
+from models.project_technology import parse_technologies
+
+FTS_TABLE = 'projects_fts'
+PG_TABLE = 'project_search'
+
+# Relative weight of each indexed column (title matters most)
+SQLITE_WEIGHTS = (10.0, 4.0, 1.0, 4.0)  # title, short_description, description, technologies
+
+SNIPPET_START = '<mark>'
+SNIPPET_END = '</mark>'
+
+_backend = None
+
+
+def search_backend(engine=None):
+    """'fts5', 'postgres' or 'like', depending on the database in use"""
+    global _backend
+    if _backend is None:
+        engine = engine or db.engine
+        if engine.dialect.name == 'postgresql':
+            _backend = 'postgres'
+        elif engine.dialect.name == 'sqlite':
+            with engine.connect() as conn:
+                options = {row[0] for row in conn.exec_driver_sql('PRAGMA compile_options')}
+            _backend = 'fts5' if 'ENABLE_FTS5' in options else 'like'
+        else:
+            _backend = 'like'
+    return _backend
+
+
+def _document(project):
+    return {
+        'id': project.id,
+        'title': project.title or '',
+        'short_description': project.short_description or '',
+        'description': project.description or '',
+        # A list, but rows written before the technologies were normalized on assignment may hold the form's JSON string
+        'technologies': ' '.join(parse_technologies(project.technologies)),
+    }
+
+
+def _index_project(connection, project):
+    backend = search_backend(connection.engine)
+    if backend == 'fts5':
+        connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {'id': project.id})
+        connection.execute(text(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, short_description, description, technologies) "
+            "VALUES (:id, :title, :short_description, :description, :technologies)"
+        ), _document(project))
+    elif backend == 'postgres':
+        connection.execute(text(
+            f"INSERT INTO {PG_TABLE} (project_id, document) VALUES (:id, "
+            "setweight(to_tsvector('english', :title), 'A') || "
+            "setweight(to_tsvector('english', :short_description || ' ' || :technologies), 'B') || "
+            "setweight(to_tsvector('english', :description), 'C')) "
+            "ON CONFLICT (project_id) DO UPDATE SET document = EXCLUDED.document"
+        ), _document(project))
+
+
+def _unindex_project(connection, project_id):
+    backend = search_backend(connection.engine)
+    if backend == 'fts5':
+        connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {'id': project_id})
+    elif backend == 'postgres':
+        connection.execute(text(f"DELETE FROM {PG_TABLE} WHERE project_id = :id"), {'id': project_id})
+
+
+@event.listens_for(Project, 'after_insert')
+@event.listens_for(Project, 'after_update')
+def _sync_project(mapper, connection, project):
+    _index_project(connection, project)
+
+
+@event.listens_for(Project, 'after_delete')
+def _remove_project(mapper, connection, project):
+    _unindex_project(connection, project.id)
+
+
+def init_search_index():
+    """Create the index structures if needed and backfill them when empty"""
+    backend = search_backend()
+    if backend == 'like':
+        return backend
+
+    conn = db.session.connection()
+    if backend == 'fts5':
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "title, short_description, description, technologies, "
+            "tokenize='porter unicode61')"
+        ))
+        indexed = conn.execute(text(f"SELECT count(*) FROM {FTS_TABLE}")).scalar()
+    else:
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {PG_TABLE} ("
+            "project_id INTEGER PRIMARY KEY REFERENCES projects(id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)"
+        ))
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{PG_TABLE}_document ON {PG_TABLE} USING GIN (document)"
+        ))
+        indexed = conn.execute(text(f"SELECT count(*) FROM {PG_TABLE}")).scalar()
+    db.session.commit()
+
+    if not indexed and db.session.query(Project.id).first():
+        rebuild_search_index()
+    return backend
+
+
+def rebuild_search_index():
+    """Re-index every project from scratch; returns the number indexed"""
+    backend = search_backend()
+    conn = db.session.connection()
+    if backend == 'fts5':
+        conn.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    elif backend == 'postgres':
+        conn.execute(text(f"DELETE FROM {PG_TABLE}"))
+    projects = Project.query.all()
+    for project in projects:
+        _index_project(conn, project)
+    db.session.commit()
+    return len(projects)
+
+
+def _fts5_query(q):
+    """Turn free text into a safe FTS5 query: every word must match, the last one as a prefix"""
+    words = re.findall(r'\w+', q)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def ranked_matches(q):
+    """
+    Subquery of (id, score) for published projects matching q, higher score first,
+    or None when q has nothing searchable.
+    """
+    backend = search_backend()
+    if backend == 'fts5':
+        match = _fts5_query(q)
+        if match is None:
+            return None
+        weights = ', '.join(str(weight) for weight in SQLITE_WEIGHTS)
+        statement = text(
+            f"SELECT p.id AS id, -bm25({FTS_TABLE}, {weights}) AS score "
+            f"FROM {FTS_TABLE} JOIN projects p ON p.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH :q AND p.status = 'published'"
+        ).bindparams(q=match)
+    elif backend == 'postgres':
+        if not q.strip():
+            return None
+        # ts_rank_cd() returns real: as float8, the score compares equal to the
+        # double precision value the keyset cursor round-trips, so ties at a
+        # page boundary are neither skipped nor repeated
+        statement = text(
+            f"SELECT p.id AS id, ts_rank_cd(s.document, websearch_to_tsquery('english', :q))::float8 AS score "
+            f"FROM {PG_TABLE} s JOIN projects p ON p.id = s.project_id "
+            "WHERE s.document @@ websearch_to_tsquery('english', :q) AND p.status = 'published'"
+        ).bindparams(q=q)
+    else:
+        if not q.strip():
+            return None
+        statement = text(
+            "SELECT id, CASE WHEN lower(title) LIKE :pattern THEN 1.0 ELSE 0.0 END AS score "
+            "FROM projects WHERE status = 'published' AND ("
+            "lower(title) LIKE :pattern OR lower(short_description) LIKE :pattern "
+            "OR lower(description) LIKE :pattern OR lower(CAST(technologies AS TEXT)) LIKE :pattern)"
+        ).bindparams(pattern=f"%{q.strip().lower()}%")
+    return statement.columns(id=Integer, score=Float).subquery('ranked')
+
+
+def snippets(q, project_ids, session=None):
+    """
+    Map project id -> highlighted excerpt of the best matching text, read
+    through `session` (db.session by default)
+    """
+    if not project_ids:
+        return {}
+    backend = search_backend()
+    params = {f'id{i}': project_id for i, project_id in enumerate(project_ids)}
+    id_list = ', '.join(f':{name}' for name in params)
+    if backend == 'fts5':
+        statement = text(
+            f"SELECT rowid, snippet({FTS_TABLE}, -1, :start, :end, '…', 16) "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :q AND rowid IN ({id_list})"
+        )
+        params.update(q=_fts5_query(q), start=SNIPPET_START, end=SNIPPET_END)
+    elif backend == 'postgres':
+        statement = text(
+            "SELECT id, ts_headline('english', "
+            "coalesce(short_description, '') || ' ' || description, websearch_to_tsquery('english', :q), "
+            "'StartSel=" + SNIPPET_START + ", StopSel=" + SNIPPET_END + ", MaxFragments=1, MaxWords=30') "
+            f"FROM projects WHERE id IN ({id_list})"
+        )
+        params.update(q=q)
+    else:
+        return {}
+    return dict((session or db.session).execute(statement, params).all())
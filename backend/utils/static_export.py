@@ -0,0 +1,154 @@
+"""
+Static export of the public API
+
+Renders every public GET endpoint to a directory of .json files (plus
+precompressed .gz/.br siblings) that nginx or a CDN can serve without the Flask
+process. A manifest of content hashes lets repeated exports rewrite only the
+files whose content changed. Paginated lists are exported whole: a static host
+cannot serve ?cursor= pages, so every page is fetched and the items are written
+to one file without cursors.
+"""
+import gzip
+import hashlib
+import json
+import os
+
+from models import Project
+from utils.pagination import MAX_PAGE_SIZE
+
+# Brotli import (optional)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+MANIFEST_NAME = 'manifest.json'
+
+# Endpoints rendered on every export, besides one detail file per published project
+STATIC_ENDPOINTS = [
+    '/api/portfolio',
+    '/api/projects',
+    '/api/projects/featured',
+    '/api/projects/facets',
+    '/api/personal-info',
+    '/api/impact-metrics',
+    '/api/technical-skills',
+    '/api/experiences',
+    '/api/educations',
+    '/api/certifications',
+    '/api/social-links',
+]
+
+# Cursor-paginated endpoints exported as a single file, and the key of their items
+PAGINATED_ENDPOINTS = {
+    '/api/projects': 'projects',
+}
+
+
+def public_endpoints():
+    """Every URL to export"""
+    project_ids = [
+        project_id for (project_id,) in
+        Project.query.with_entities(Project.id).filter_by(status='published').order_by(Project.id.asc())
+    ]
+    return STATIC_ENDPOINTS + [f'/api/projects/{project_id}' for project_id in project_ids]
+
+
+def _load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME)) as f:
+            return json.load(f).get('files', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_file(path, data):
+    """Write atomically so a server never serves a half-written file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _variants(body):
+    """The file body plus its precompressed siblings"""
+    variants = {'': body, '.gz': gzip.compress(body, compresslevel=9, mtime=0)}
+    if BROTLI_AVAILABLE:
+        variants['.br'] = brotli.compress(body, quality=11)
+    return variants
+
+
+def _remove(path):
+    for suffix in ('', '.gz', '.br'):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+def _export_body(app, client, url):
+    """The body to write for url, or None if the endpoint did not answer 200"""
+    if url not in PAGINATED_ENDPOINTS:
+        response = client.get(url)
+        return response.get_data() if response.status_code == 200 else None
+
+    key = PAGINATED_ENDPOINTS[url]
+    items = []
+    query = {'limit': MAX_PAGE_SIZE}
+    while True:
+        response = client.get(url, query_string=query)
+        if response.status_code != 200:
+            return None
+        page = response.get_json()
+        items.extend(page[key])
+        if not page.get('next_cursor'):
+            break
+        query['cursor'] = page['next_cursor']
+    return app.json.encode({'count': len(items), key: items, 'next_cursor': None, 'prev_cursor': None})
+
+
+def export_public_api(app, output_dir):
+    """
+    Render every public endpoint into output_dir.
+    Returns a dict with the written, unchanged and removed file paths.
+    """
+    previous = _load_manifest(output_dir)
+    files = {}
+    result = {'written': [], 'unchanged': [], 'removed': []}
+
+    client = app.test_client()
+    with app.app_context():
+        endpoints = public_endpoints()
+
+    for url in endpoints:
+        body = _export_body(app, client, url)
+        if body is None:
+            continue
+
+        relative_path = f"{url.lstrip('/')}.json"
+        path = os.path.join(output_dir, relative_path)
+        digest = hashlib.sha256(body).hexdigest()
+        files[relative_path] = {'sha256': digest, 'size': len(body)}
+
+        if previous.get(relative_path, {}).get('sha256') == digest and os.path.exists(path):
+            result['unchanged'].append(relative_path)
+            continue
+
+        for suffix, data in _variants(body).items():
+            _write_file(path + suffix, data)
+        result['written'].append(relative_path)
+
+    # Drop files for endpoints that no longer exist (e.g. unpublished projects)
+    for relative_path in set(previous) - set(files):
+        _remove(os.path.join(output_dir, relative_path))
+        result['removed'].append(relative_path)
+
+    if result['written'] or result['removed'] or not previous:
+        manifest = {'files': dict(sorted(files.items()))}
+        _write_file(
+            os.path.join(output_dir, MANIFEST_NAME),
+            json.dumps(manifest, indent=2).encode('utf-8')
+        )
+    return result
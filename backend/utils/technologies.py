@@ -0,0 +1,54 @@
+"""
+Technology filtering backed by the normalized project_technologies table
+"""
+from sqlalchemy import exists, select
+
+from models import db, Project, ProjectTechnology
+from models.project_technology import parse_technologies, technology_slug
+
+
+def filter_by_technologies(query, technologies, match='all'):
+    """
+    Restrict a Project query to projects using the given technologies, in SQL.
+    match='all' requires every technology (AND), match='any' at least one (OR).
+    """
+    slugs = sorted({technology_slug(name) for name in technologies if name.strip()})
+    if not slugs:
+        return query
+    if match not in ('all', 'any'):
+        raise ValueError("tech_match must be 'all' or 'any'")
+
+    if match == 'any':
+        return query.filter(Project.id.in_(
+            select(ProjectTechnology.project_id).where(ProjectTechnology.slug.in_(slugs))
+        ))
+    # One IN per technology: each is a range read of the (slug, project_id)
+    # index, where GROUP BY project_id HAVING count() would need a temporary
+    # b-tree to group the matches
+    for slug in slugs:
+        query = query.filter(Project.id.in_(
+            select(ProjectTechnology.project_id).where(ProjectTechnology.slug == slug)
+        ))
+    return query
+
+
+def backfill_project_technologies():
+    """Rebuild the association rows of every project from its technologies list; returns the number of projects"""
+    projects = Project.query.all()
+    for project in projects:
+        # Re-assigning runs the sync in models.project (and normalizes a stored string)
+        project.technologies = project.technologies
+    db.session.commit()
+    return len(projects)
+
+
+def needs_backfill():
+    """
+    True when a project lists technologies but has no association rows (e.g.
+    it was created before the table existed). Only the technologies of
+    projects without rows are read, so this stays cheap on every start.
+    """
+    unlinked = select(Project.technologies).where(
+        ~exists().where(ProjectTechnology.project_id == Project.id)
+    )
+    return any(parse_technologies(value) for value in db.session.execute(unlinked).scalars())
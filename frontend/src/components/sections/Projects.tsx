@@ -149,7 +149,7 @@ export default function Projects() {
                 <div className="p-6">
                   <h3 className="font-heading text-base sm:text-lg md:text-[1.125rem] font-bold mb-2 text-white">{project.title}</h3>
                   <p className="font-body text-gray-300 text-sm sm:text-base mb-4 line-clamp-2">
-                    {project.short_description || project.description}
+                    {project.short_description}
                   </p>
                   {project.technologies && project.technologies.length > 0 && (
                     <div className="flex flex-wrap gap-2 mb-4">
@@ -21,7 +21,7 @@ export interface Project {
 }
 
 export const projectsAPI = {
-  getAll: async (params?: { featured?: boolean; category?: string; limit?: number }): Promise<{ count: number; projects: Project[] }> => {
+  getAll: async (params?: { featured?: boolean; category?: string; limit?: number; cursor?: string; fields?: string }): Promise<{ count: number; projects: Project[]; next_cursor?: string | null; prev_cursor?: string | null }> => {
     const response = await apiClient.get('/api/projects', { params });
     return response.data;
   },